@@ -16,6 +16,12 @@ from agent.state import AuraState
 
 logger = logging.getLogger(__name__)
 
+# Pending actions and raw button payloads that hand the message to token_collector
+_TOKEN_FLOW_ACTIONS = frozenset({
+    "connect_canvas", "awaiting_canvas_token", "connect_google", "connect_microsoft",
+})
+_TOKEN_FLOW_COMMANDS = frozenset({"connect_canvas", "connect_google", "connect_microsoft"})
+
 
 def route_after_token_collector(state: AuraState) -> str:
     """If user said something else (not a token), hand off to main flow."""
@@ -29,8 +35,7 @@ def route_after_ingress(state: AuraState) -> str:
     # Pending token collection takes priority
     action = state.get("pending_action")
     raw = state.get("raw_input", "")
-    if action in ("connect_canvas", "awaiting_canvas_token", "connect_google", "connect_microsoft") or \
-       raw in ("connect_canvas", "connect_google", "connect_microsoft"):
+    if action in _TOKEN_FLOW_ACTIONS or raw in _TOKEN_FLOW_COMMANDS:
         return "token_collector"
     # Auto-detect: user pasted a Canvas token without tapping the button first
     if _looks_like_canvas_token(raw):
@@ -1,6 +1,6 @@
-import json
 import logging
 
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -45,6 +45,11 @@ For connection help: Google → include the google_connection_url directly. Canv
 
 llm = ChatOpenAI(model="gpt-4o", api_key=settings.openai_api_key)
 
+def _dumps(obj) -> str:
+    # Compact on purpose: indentation only adds input tokens, the model reads either.
+    # orjson serializes datetimes natively; default=str covers anything else (UUIDs, Decimals)
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 async def response_composer(state: AuraState) -> dict:
     """Generate a natural WhatsApp response using Claude.
@@ -61,26 +66,37 @@ async def response_composer(state: AuraState) -> dict:
     history = context.pop("conversation_history", [])
     memory_facts = context.pop("memory_facts", [])
 
-    parts = []
+    # One flat list of lines, joined once; a blank line separates sections
+    lines: list[str] = []
 
     if memory_facts:
-        facts_block = "\n".join(f"- [{f['category']}] {f['fact']}" for f in memory_facts)
-        parts.append(f"What you remember about this user:\n{facts_block}")
+        lines.append("What you remember about this user:")
+        lines.extend(f"- [{f['category']}] {f['fact']}" for f in memory_facts)
+        lines.append("")
 
     if history:
-        lines = []
-        for msg in history:
-            prefix = "User" if msg["role"] == "user" else "Donna"
-            lines.append(f"{prefix}: {msg['content']}")
-        parts.append("Recent conversation:\n" + "\n".join(lines))
-
-    parts.append(f"User message: {text}")
-    parts.append(f"Intent: {intent}")
-    parts.append(f"User context:\n{json.dumps(context, indent=2, default=str)}")
-    parts.append(f"Tool results:\n{json.dumps(tool_results, indent=2, default=str)}")
-    parts.append("Compose a response for the user.")
-
-    user_prompt = "\n\n".join(parts)
+        lines.append("Recent conversation:")
+        lines.extend(
+            f"{'User' if msg['role'] == 'user' else 'Donna'}: {msg['content']}"
+            for msg in history
+        )
+        lines.append("")
+
+    lines += [
+        f"User message: {text}",
+        "",
+        f"Intent: {intent}",
+        "",
+        "User context:",
+        _dumps(context),
+        "",
+        "Tool results:",
+        _dumps(tool_results),
+        "",
+        "Compose a response for the user.",
+    ]
+
+    user_prompt = "\n".join(lines)
 
     response = await llm.ainvoke([
         SystemMessage(content=COMPOSER_SYSTEM_PROMPT),
@@ -62,17 +62,19 @@ async def memory_writer(state: AuraState) -> dict:
             ])
             facts = json.loads(extraction.content)
 
-            async with async_session() as session:
-                for fact_data in facts:
-                    fact = MemoryFact(
-                        id=generate_uuid(),
-                        user_id=user_id,
-                        fact=fact_data["fact"],
-                        category=fact_data.get("category", "context"),
-                    )
-                    session.add(fact)
-                    memory_updates.append(fact_data)
-                await session.commit()
+            # Most turns have nothing worth remembering; skip the session then
+            if facts:
+                async with async_session() as session:
+                    for fact_data in facts:
+                        fact = MemoryFact(
+                            id=generate_uuid(),
+                            user_id=user_id,
+                            fact=fact_data["fact"],
+                            category=fact_data.get("category", "context"),
+                        )
+                        session.add(fact)
+                        memory_updates.append(fact_data)
+                    await session.commit()
 
         except Exception:
             logger.exception("Failed to extract/store memory facts")
@@ -1,4 +1,5 @@
 import logging
+import re
 
 import httpx
 from sqlalchemy import select
@@ -7,9 +8,21 @@ from agent.state import AuraState
 from config import settings
 from db.models import OAuthToken, User, generate_uuid
 from db.session import async_session
+from tools.canvas import invalidate_canvas_token
 
 logger = logging.getLogger(__name__)
 
+# Opt-out / conversational phrases — hand off to main flow for natural response.
+# Plain substrings, unioned into one pattern so a reply is scanned once.
+_CONVERSATIONAL_PHRASES = (
+    "no", "don't", "dont", "nah", "nope", "nevermind", "cancel", "skip", "later",
+    "hey", "hello", "hi", "wanna", "want", "just", "contacted", "hold", "wait",
+    "sorry", "wrong", "oops", "forget", "changed", "mind", "actually", "?",
+)
+_CONVERSATIONAL_RE = re.compile(
+    "|".join(map(re.escape, _CONVERSATIONAL_PHRASES)), re.IGNORECASE,
+)
+
 
 def _looks_like_canvas_token(text: str) -> bool:
     """Canvas PATs are typically 64+ char alphanumeric strings, no spaces."""
@@ -17,15 +30,7 @@ def _looks_like_canvas_token(text: str) -> bool:
         return False
     if " " in text:
         return False
-    # Opt-out / conversational phrases — hand off to main flow for natural response
-    lower = text.lower()
-    if any(w in lower for w in (
-        "no", "don't", "dont", "nah", "nope", "nevermind", "cancel", "skip", "later",
-        "hey", "hello", "hi", "wanna", "want", "just", "contacted", "hold", "wait",
-        "sorry", "wrong", "oops", "forget", "changed", "mind", "actually", "?",
-    )):
-        return False
-    return True
+    return _CONVERSATIONAL_RE.search(text) is None
 
 
 async def _validate_canvas_token(token: str) -> bool:
@@ -139,6 +144,7 @@ async def token_collector(state: AuraState) -> dict:
             user = user_result.scalar_one()
             user.pending_action = None
             await session.commit()
+        invalidate_canvas_token(user_id)
 
         return {
             "pending_action": None,
@@ -2,6 +2,7 @@
 
 import asyncio
 import logging
+from datetime import UTC, datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -21,20 +22,27 @@ LOOP_INTERVAL_MINUTES = 5
 async def run_donna_for_all_users():
     """Fetch all onboarded users and run the Donna loop for each."""
     async with async_session() as session:
+        # Timezones ride along so each user's run skips its own lookup
         result = await session.execute(
-            select(User.id).where(User.onboarding_complete.is_(True))
+            select(User.id, User.timezone).where(User.onboarding_complete.is_(True))
         )
-        user_ids = [row[0] for row in result.all()]
+        user_zones = dict(result.all())
+        user_ids = list(user_zones)
 
     if not user_ids:
         return
 
     logger.info("Running Donna loop for %d users", len(user_ids))
 
-    # Run all users concurrently but catch per-user failures
+    # One wall-clock reading per tick, shared by every user's run
+    now = datetime.now(UTC).replace(tzinfo=None)
+
+    # Run all users concurrently but catch per-user failures. Each user's
+    # pipeline runs start to finish on its own, so one slow LLM call never
+    # holds back another user's delivery.
     async def _safe_run(uid: str):
         try:
-            sent = await donna_loop(uid)
+            sent = await donna_loop(uid, now=now, user_tz=user_zones[uid] or "UTC")
             if sent:
                 logger.info("Donna sent %d message(s) to user %s", sent, uid)
         except Exception:
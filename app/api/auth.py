@@ -5,15 +5,23 @@ from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlalchemy import select
 
 from config import settings
-from db.models import User
+from db.models import User, is_uuid
 from db.session import async_session
-from tools.composio_client import initiate_connection
+from tools.composio_client import initiate_connection, invalidate_connected_integrations
 from tools.whatsapp import send_whatsapp_message
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _invalid_user_response() -> HTMLResponse:
+    """Callback reached without a well-formed user_id (e.g. a hand-edited link)."""
+    return HTMLResponse(
+        "<h2>This link is invalid. Start the connection again from WhatsApp.</h2>",
+        status_code=400,
+    )
+
+
 # ---------- Google OAuth (via Composio) ----------
 # Gmail and Google Calendar are separate Composio apps, each needing their own
 # auth config. We chain them: Gmail first → callback initiates Calendar → done.
@@ -34,7 +42,10 @@ async def google_login(user_id: str):
 @router.get("/google/callback/gmail")
 async def google_callback_gmail(request: Request, user_id: str = ""):
     """Gmail OAuth done — now initiate Google Calendar connection."""
+    if not is_uuid(user_id):
+        return _invalid_user_response()
     logger.info("Gmail connected for user %s, chaining Calendar auth...", user_id)
+    invalidate_connected_integrations(user_id)
     connection = await initiate_connection(
         user_id=user_id,
         auth_config_id=settings.composio_gcal_auth_config_id,
@@ -47,6 +58,9 @@ async def google_callback_gmail(request: Request, user_id: str = ""):
 @router.get("/google/callback/calendar")
 async def google_callback_calendar(request: Request, user_id: str = ""):
     """Both Gmail and Calendar are now connected. Confirm to the user."""
+    if not is_uuid(user_id):
+        return _invalid_user_response()
+    invalidate_connected_integrations(user_id)
     async with async_session() as session:
         user_result = await session.execute(select(User).where(User.id == user_id))
         user = user_result.scalar_one_or_none()
@@ -82,6 +96,9 @@ async def microsoft_login(user_id: str):
 @router.get("/microsoft/callback")
 async def microsoft_callback(request: Request, user_id: str = ""):
     """Microsoft OAuth done — mail + calendar are both ready."""
+    if not is_uuid(user_id):
+        return _invalid_user_response()
+    invalidate_connected_integrations(user_id)
     async with async_session() as session:
         user_result = await session.execute(select(User).where(User.id == user_id))
         user = user_result.scalar_one_or_none()
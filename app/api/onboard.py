@@ -9,6 +9,7 @@ from sqlalchemy import select
 from config import settings
 from db.models import MemoryFact, OAuthToken, User, generate_uuid
 from db.session import async_session
+from tools.canvas import invalidate_canvas_token
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -112,6 +113,7 @@ async def submit_canvas_token(body: CanvasTokenRequest):
         if user.pending_action in ("awaiting_canvas_token", "connect_canvas"):
             user.pending_action = None
         await session.commit()
+    invalidate_canvas_token(user_id)
 
     logger.info("Canvas token stored for user %s (phone %s)", user_id, body.user_id)
     return {"ok": True}
@@ -1,18 +1,56 @@
 import uuid
 from datetime import datetime
 
-from pgvector.sqlalchemy import Vector
+from pgvector.sqlalchemy import HALFVEC
 from sqlalchemy import (
     Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text, UniqueConstraint,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import DeclarativeBase, relationship
 
 
+# (max_rows, m, ef_construction) for each HNSW size tier. create_all() builds the
+# first tier; scripts/build_vector_indexes.py moves indexes up as tables grow.
+HNSW_TIERS = ((100_000, 16, 64), (1_000_000, 24, 100))
+
+
+def _hnsw_index(name: str) -> Index:
+    """HNSW cosine index on a halfvec `embedding` column (Postgres only)."""
+    _, m, ef_construction = HNSW_TIERS[0]
+    return Index(
+        name,
+        "embedding",
+        postgresql_using="hnsw",
+        postgresql_ops={"embedding": "halfvec_cosine_ops"},
+        postgresql_with={"m": m, "ef_construction": ef_construction},
+    )
+
+
 def generate_uuid() -> str:
     return str(uuid.uuid4())
 
 
+def is_uuid(value) -> bool:
+    """Whether `value` can be bound to a UUIDString column.
+
+    Postgres rejects a malformed uuid parameter with DataError instead of
+    matching nothing, so ids from query params or the LLM are checked first.
+    """
+    try:
+        uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        return False
+    return True
+
+
+# Native 16-byte `uuid` on Postgres, plain string elsewhere (SQLite in tests).
+# as_uuid=False keeps ids as `str` on the Python side, so callers don't change.
+# Existing databases must run scripts/migrate_uuid_columns.py BEFORE these models
+# are deployed: parameters bind as uuid, and Postgres has no varchar = uuid operator.
+UUIDString = String().with_variant(UUID(as_uuid=False), "postgresql")
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -20,7 +58,7 @@ class Base(DeclarativeBase):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
     phone = Column(String, unique=True, nullable=False)
     name = Column(String)
     timezone = Column(String, default="UTC")
@@ -47,8 +85,8 @@ class User(Base):
 class OAuthToken(Base):
     __tablename__ = "oauth_tokens"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     provider = Column(String, nullable=False)  # canvas, google, microsoft
     access_token = Column(Text, nullable=False)  # encrypted at rest
     refresh_token = Column(Text)
@@ -60,9 +98,16 @@ class OAuthToken(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Pending tasks by due date — Postgres' default ASC order is already NULLS LAST
+        Index(
+            "ix_task_user_pending_due", "user_id", "due_date",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(Text)
     source = Column(String, default="manual")  # manual, canvas, email
@@ -78,13 +123,14 @@ class Task(Base):
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
+    __table_args__ = (_hnsw_index("ix_journal_entry_embedding"),)
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     entry_type = Column(String, nullable=False)  # reflection, gratitude, brain_dump, vent
     content = Column(Text, nullable=False)
     mood_score = Column(Integer)  # 1-10
-    embedding = Column(Vector(1536))
+    embedding = Column(HALFVEC(1536))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="journal_entries")
@@ -92,16 +138,17 @@ class JournalEntry(Base):
 
 class VoiceNote(Base):
     __tablename__ = "voice_notes"
+    __table_args__ = (_hnsw_index("ix_voice_note_embedding"),)
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     audio_url = Column(String, nullable=False)
     duration_seconds = Column(Integer)
     transcript = Column(Text)
     summary = Column(Text)
     tags = Column(JSON)
     intent = Column(String)
-    embedding = Column(Vector(1536))
+    embedding = Column(HALFVEC(1536))
     created_at = Column(DateTime, default=datetime.utcnow)
 
     user = relationship("User", back_populates="voice_notes")
@@ -109,9 +156,10 @@ class VoiceNote(Base):
 
 class MoodLog(Base):
     __tablename__ = "mood_logs"
+    __table_args__ = (Index("ix_mood_log_user_created", "user_id", "created_at"),)
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     score = Column(Integer, nullable=False)  # 1-10
     note = Column(Text)
     source = Column(String, default="manual")  # manual, reflection, inferred
@@ -122,9 +170,10 @@ class MoodLog(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (Index("ix_expense_user_created", "user_id", "created_at"),)
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     amount = Column(Float, nullable=False)
     currency = Column(String, default="USD")
     category = Column(String)
@@ -137,8 +186,8 @@ class Expense(Base):
 class Habit(Base):
     __tablename__ = "habits"
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     name = Column(String, nullable=False)
     target_frequency = Column(String, default="daily")
     current_streak = Column(Integer, default=0)
@@ -151,9 +200,19 @@ class Habit(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        Index("ix_chat_user_role_created", "user_id", "role", "created_at"),
+        # Recent history across roles; role rides along so the window filter stays in the index
+        Index("ix_chat_user_created", "user_id", "created_at", postgresql_include=["role"]),
+        # Daily proactive cap — a small slice of chat history
+        Index(
+            "ix_chat_user_proactive_created", "user_id", "created_at",
+            postgresql_where=text("is_proactive AND role = 'assistant'"),
+        ),
+    )
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     role = Column(String, nullable=False)  # "user" | "assistant"
     content = Column(Text, nullable=False)
     is_proactive = Column(Boolean, default=False)
@@ -164,13 +223,17 @@ class ChatMessage(Base):
 
 class MemoryFact(Base):
     __tablename__ = "memory_facts"
+    __table_args__ = (
+        _hnsw_index("ix_memory_fact_embedding"),
+        Index("ix_memory_fact_user_created", "user_id", "created_at"),
+    )
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     fact = Column(Text, nullable=False)
     category = Column(String)  # preference, pattern, context, relationship
     confidence = Column(Float, default=0.8)
-    embedding = Column(Vector(1536))
+    embedding = Column(HALFVEC(1536))
     source_message_id = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_referenced = Column(DateTime)
@@ -185,8 +248,8 @@ class SignalState(Base):
         Index("ix_signal_state_user_id", "user_id"),
     )
 
-    id = Column(String, primary_key=True, default=generate_uuid)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    id = Column(UUIDString, primary_key=True, default=generate_uuid)
+    user_id = Column(UUIDString, ForeignKey("users.id"), nullable=False)
     dedup_key = Column(String, nullable=False)
     signal_type = Column(String, nullable=False)
     first_seen = Column(DateTime, default=datetime.utcnow)
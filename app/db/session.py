@@ -1,14 +1,61 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import os
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from config import settings
 
-_pool_kwargs = {"pool_size": 3, "max_overflow": 2} if "sqlite" not in settings.database_url else {}
+_is_postgres = "sqlite" not in settings.database_url
+
+# Sized to the host so concurrent per-user Donna runs aren't capped at 5 connections
+_POOL_SIZE = min(20, (os.cpu_count() or 1) * 2)
+
+_pool_kwargs = {
+    "pool_size": _POOL_SIZE,
+    "max_overflow": 10,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+} if _is_postgres else {}
 engine = create_async_engine(settings.database_url, echo=False, **_pool_kwargs)
+
+if _is_postgres:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_session_defaults(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # Candidate list size for HNSW scans — higher recall than the default of 40
+        cursor.execute("SET hnsw.ef_search = 100")
+        # JIT warmup costs more than it saves on these short OLTP queries. Sent as a
+        # SET, not a startup parameter, which poolers may reject.
+        if settings.database_disable_jit:
+            cursor.execute("SET jit = off")
+        cursor.close()
+
+
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+# The proactive loop gathers several loaders per user and the scheduler runs
+# every user at once. Those loaders share this many connections, so a tick
+# can't drain the pool and the reply path always finds one free.
+BACKGROUND_MAX_SESSIONS = max(2, _POOL_SIZE // 2)
+
+_background_slots = asyncio.Semaphore(BACKGROUND_MAX_SESSIONS)
+
+
+@asynccontextmanager
+async def background_session() -> AsyncIterator[AsyncSession]:
+    """async_session() for the proactive loop's fan-out loaders.
+
+    Waits for one of BACKGROUND_MAX_SESSIONS slots before checking out a
+    connection. Don't nest these: a loader holding a slot must not wait on another.
+    """
+    async with _background_slots, async_session() as session:
+        yield session
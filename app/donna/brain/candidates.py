@@ -1,8 +1,10 @@
 """Candidate generator — asks the LLM what Donna should say (if anything)."""
 
-import json
 import logging
+import time
+from collections import OrderedDict
 
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -17,7 +19,7 @@ You receive a full context window: the user's profile, current signals (things t
 Your job: generate 0-3 candidate messages that Donna might send RIGHT NOW. For each, score it.
 
 Rules:
-- If nothing is worth saying, return an empty list. Silence is valid. Don't manufacture messages.
+- If nothing is worth saying, return an empty candidates list. Silence is valid. Don't manufacture messages.
 - Each message should feel like Donna noticed something and is bringing it up naturally.
 - Never repeat something Donna already said in the recent conversation.
 - Messages should be short (1-3 sentences max), WhatsApp-style.
@@ -37,56 +39,149 @@ For each candidate message, provide:
 - trigger_signals: list of signal types that motivated this message
 - category: one of [deadline_warning, schedule_info, task_reminder, wellbeing, social, nudge, briefing, memory_recall]
 
-Return ONLY a JSON array. No markdown, no explanation. If nothing to say, return [].
+Return ONLY a JSON object with a "candidates" array. No markdown, no explanation.
+If nothing to say, return {"candidates": []}.
 
 Example output:
-[
-  {
-    "message": "SE due Friday 11:59pm. You've got a 3-hour gap after your 2pm lecture tomorrow — want me to block it?",
-    "relevance": 9,
-    "timing": 8,
-    "urgency": 7,
-    "trigger_signals": ["canvas_deadline_approaching", "calendar_gap_detected"],
-    "category": "deadline_warning"
-  }
-]"""
-
-llm = ChatOpenAI(model="gpt-4o", api_key=settings.openai_api_key, temperature=0.7)
-
-
-async def generate_candidates(context: dict) -> list[dict]:
-    """Ask the LLM to generate scored candidate messages.
-
-    Returns list of candidate dicts with message, scores, and metadata.
-    Returns empty list if the LLM decides nothing is worth saying.
-    """
-    user_prompt = json.dumps(context, indent=2, default=str)
-
+{
+  "candidates": [
+    {
+      "message": "SE due Friday 11:59pm. You've got a 3-hour gap after your 2pm lecture tomorrow — want me to block it?",
+      "relevance": 9,
+      "timing": 8,
+      "urgency": 7,
+      "trigger_signals": ["canvas_deadline_approaching", "calendar_gap_detected"],
+      "category": "deadline_warning"
+    }
+  ]
+}"""
+
+GATE_PROMPT = """You screen proactive messages for Donna, a personal assistant on WhatsApp.
+
+You receive the user's context: profile, current signals, recent conversation, tasks, mood, and the current time.
+
+Is there anything concrete and actionable worth messaging this user about RIGHT NOW? Most of the time there isn't.
+
+Answer with exactly one word: YES or NO."""
+
+# Built once: the system prompt is byte-identical across calls, so it always forms the
+# leading prefix OpenAI's automatic prompt caching keys on.
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+_GATE_SYSTEM_MESSAGE = SystemMessage(content=GATE_PROMPT)
+
+# The context keys the model sees, most stable first. Anything else on the context
+# is left out of the prompt. The prompt cache matches on the longest common prefix,
+# so per-user data that rarely changes between 5-minute ticks follows the system prompt,
+# and the clock and signals — different on every run — come last.
+_CANDIDATE_INPUT_KEYS = (
+    "user_id",
+    "user",
+    "memory_facts",
+    "pending_tasks",
+    "recent_moods",
+    "recent_conversation",
+    "recalled_memories",
+    "today_spending",
+    "proactive_sent_today",
+    "minutes_since_last_message",
+    "day_of_week",
+    "current_time",
+    "signals",
+)
+
+# Per-message cap on conversation content; one long dump shouldn't balloon the prompt
+_MESSAGE_CONTENT_MAX_CHARS = 400
+
+# JSON mode guarantees a parseable object root, so no markdown-fence handling is needed
+llm = ChatOpenAI(
+    model="gpt-4o",
+    api_key=settings.openai_api_key,
+    temperature=0.7,
+    # Three short candidates fit well within this; the cap bounds worst-case latency
+    max_tokens=512,
+    model_kwargs={"response_format": {"type": "json_object"}},
+)
+
+# Cheap first pass: most evaluations end in silence, so a small model answers
+# "anything to say?" and the full model only runs on a YES.
+gate_llm = ChatOpenAI(
+    model="gpt-4o-mini",
+    api_key=settings.openai_api_key,
+    temperature=0,
+    max_tokens=1,
+)
+
+
+# Most calls answer "nothing worth saying". When the same user has the same
+# kinds of signals and no new conversation since such an answer, the LLM
+# would almost certainly say it again, so skip the call for a while.
+EMPTY_RESULT_TTL_SECONDS = 600
+
+# decision key → expiry (monotonic). Keys change with every new conversation
+# or signal mix, so entries are kept in expiry order and pruned from the front.
+_empty_result_cache: OrderedDict[tuple, float] = OrderedDict()
+
+
+def _decision_key(context: dict) -> tuple:
+    conversation = context.get("recent_conversation") or []
+    return (
+        context.get("user_id"),
+        tuple(sorted(s["type"] for s in context.get("signals", []))),
+        conversation[-1]["time"] if conversation else None,
+    )
+
+
+def _recently_empty(context: dict) -> bool:
+    key = _decision_key(context)
+    expiry = _empty_result_cache.get(key)
+    if expiry is None:
+        return False
+    if time.monotonic() >= expiry:
+        del _empty_result_cache[key]
+        return False
+    logger.debug("Skipping LLM for user %s — same inputs recently yielded nothing", key[0])
+    return True
+
+
+def _remember_if_empty(context: dict, candidates: list[dict]) -> None:
+    if candidates:
+        return
+    now = time.monotonic()
+    key = _decision_key(context)
+    _empty_result_cache[key] = now + EMPTY_RESULT_TTL_SECONDS
+    _empty_result_cache.move_to_end(key)
+    while next(iter(_empty_result_cache.values())) <= now:
+        _empty_result_cache.popitem(last=False)
+
+
+def _build_user_message(context: dict) -> HumanMessage:
+    trimmed = {k: context[k] for k in _CANDIDATE_INPUT_KEYS if k in context}
+
+    # Cap each message only in the prompt; the scorer's dedup still sees full text
+    if "recent_conversation" in trimmed:
+        trimmed["recent_conversation"] = [
+            {**m, "content": m["content"][:_MESSAGE_CONTENT_MAX_CHARS]}
+            for m in trimmed["recent_conversation"]
+        ]
+
+    # Compact output: indentation only inflates the prompt's token count
+    return HumanMessage(content=orjson.dumps(trimmed, default=str).decode())
+
+
+def _gate_says_yes(response) -> bool:
+    return not response.content.strip().upper().startswith("NO")
+
+
+def _parse_candidates(raw: str, user_id: str | None) -> list[dict]:
     try:
-        response = await llm.ainvoke([
-            SystemMessage(content=SYSTEM_PROMPT),
-            HumanMessage(content=user_prompt),
-        ])
-    except Exception:
-        logger.exception("LLM call failed in candidate generation")
-        return []
-
-    # Parse the JSON response
-    raw = response.content.strip()
-
-    # Strip markdown code fences if present
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[1] if "\n" in raw else raw[3:]
-        if raw.endswith("```"):
-            raw = raw[:-3]
-        raw = raw.strip()
-
-    try:
-        candidates = json.loads(raw)
-    except json.JSONDecodeError:
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         logger.error("Failed to parse candidate JSON: %s", raw[:200])
         return []
 
+    # JSON mode returns {"candidates": [...]}; tolerate a bare array as well
+    candidates = parsed.get("candidates", []) if isinstance(parsed, dict) else parsed
+
     if not isinstance(candidates, list):
         return []
 
@@ -103,5 +198,38 @@ async def generate_candidates(context: dict) -> list[dict]:
                 "category": c.get("category", "nudge"),
             })
 
-    logger.info("Generated %d candidate messages for user %s", len(valid), context.get("user_id"))
+    logger.info("Generated %d candidate messages for user %s", len(valid), user_id)
     return valid
+
+
+async def generate_candidates(context: dict) -> list[dict]:
+    """Ask the LLM to generate scored candidate messages.
+
+    Returns list of candidate dicts with message, scores, and metadata.
+    Returns empty list if the LLM decides nothing is worth saying.
+    """
+    if _recently_empty(context):
+        return []
+
+    user_message = _build_user_message(context)
+
+    try:
+        gate_open = _gate_says_yes(await gate_llm.ainvoke([_GATE_SYSTEM_MESSAGE, user_message]))
+    except Exception:
+        logger.exception("Candidate gate failed, falling through")
+        gate_open = True
+    if not gate_open:
+        logger.debug("Gate: nothing to say for user %s", context.get("user_id"))
+        _remember_if_empty(context, [])
+        return []
+
+    try:
+        response = await llm.ainvoke([_SYSTEM_MESSAGE, user_message])
+    except Exception:
+        logger.exception("LLM call failed in candidate generation")
+        return []
+
+    candidates = _parse_candidates(response.content, context.get("user_id"))
+    _remember_if_empty(context, candidates)
+    return candidates
+
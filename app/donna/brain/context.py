@@ -1,155 +1,318 @@
 """Context builder — assembles the full picture of a user's life for the LLM."""
 
+import asyncio
 import logging
-from datetime import datetime, timedelta, timezone
+import time
+from collections import OrderedDict, defaultdict
+from datetime import UTC, datetime, timedelta, tzinfo
 
-from sqlalchemy import select
+from sqlalchemy import Row, func, select
 
 from db.models import ChatMessage, Expense, MemoryFact, MoodLog, Task, User
-from db.session import async_session
-from donna.brain.rules import count_proactive_today
+from db.session import background_session
+from donna.brain.rules import count_proactive_today, user_zone
 from donna.memory.recall import recall_relevant_memories
 from donna.signals.base import Signal
 
 logger = logging.getLogger(__name__)
 
+_HISTORY_LIMIT = 10
 
-async def build_context(user_id: str, signals: list[Signal]) -> dict:
-    """Build a complete context window for the brain's LLM call.
+# Near-simultaneous runs for the same user share one round of DB reads.
+# Signals and recall stay per-call; only the loaders' results are reused.
+_DB_SECTIONS_TTL_SECONDS = 5
 
-    Returns a dict with everything Donna needs to decide what to say:
-    - user profile
-    - current signals
-    - recent conversation
-    - memory facts
-    - pending tasks
-    - recent mood
-    - today's spending
-    - current time info
-    """
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
+# Oldest entry first, so expired ones are pruned from the front on every store.
+# Locks exist only while a user's load is in flight.
+_db_sections_cache: OrderedDict[str, tuple[float, tuple]] = OrderedDict()
+_db_sections_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
-    context: dict = {
-        "user_id": user_id,
-        "current_time": now.isoformat(),
-        "day_of_week": now.strftime("%A"),
-    }
 
-    # Signals (the reason we're considering messaging)
-    context["signals"] = [
-        {"type": s.type.value, "data": s.data, "urgency_hint": s.urgency_hint}
-        for s in signals
-    ]
+# ── Independent loaders ──────────────────────────────────────────────
+# Each opens its own session: one AsyncSession can't run queries concurrently,
+# and these have no data dependency on each other, so build_context gathers them.
+# They select only the columns the context uses; rows support attribute access.
+# background_session caps how many connections all users' loaders hold at once.
+
+async def _load_user(user_id: str) -> Row | None:
+    async with background_session() as session:
+        result = await session.execute(
+            select(
+                User.name, User.timezone, User.wake_time, User.sleep_time,
+                User.reminder_frequency, User.tone_preference,
+            )
+            .where(User.id == user_id)
+        )
+        return result.one_or_none()
 
-    async with async_session() as session:
-        # ── User profile ─────────────────────────────────────────────
-        user_result = await session.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
-        if not user:
-            return context
-
-        context["user"] = {
-            "name": user.name or "",
-            "timezone": user.timezone or "UTC",
-            "wake_time": user.wake_time or "08:00",
-            "sleep_time": user.sleep_time or "23:00",
-            "reminder_frequency": user.reminder_frequency or "normal",
-            "tone_preference": user.tone_preference or "casual",
-        }
 
-        # ── Recent conversation (last 10 messages) ───────────────────
-        history_result = await session.execute(
-            select(ChatMessage)
+async def _load_history(user_id: str) -> list[Row]:
+    """Last _HISTORY_LIMIT messages, newest first."""
+    async with background_session() as session:
+        result = await session.execute(
+            select(
+                ChatMessage.role, ChatMessage.content, ChatMessage.created_at,
+            )
             .where(ChatMessage.user_id == user_id)
             .order_by(ChatMessage.created_at.desc())
-            .limit(10)
+            .limit(_HISTORY_LIMIT)
         )
-        history = history_result.scalars().all()
-        context["recent_conversation"] = [
-            {
-                "role": m.role,
-                "content": m.content,
-                "time": m.created_at.isoformat(),
-            }
-            for m in reversed(history)
-        ]
-
-        # ── Last assistant message time (for cooldown checks) ────────
-        last_donna_result = await session.execute(
+        return result.all()
+
+
+async def _load_last_assistant_time(user_id: str) -> datetime | None:
+    """Fallback for when no assistant message is in the loaded history."""
+    async with background_session() as session:
+        result = await session.execute(
             select(ChatMessage.created_at)
             .where(ChatMessage.user_id == user_id, ChatMessage.role == "assistant")
             .order_by(ChatMessage.created_at.desc())
             .limit(1)
         )
-        last_donna = last_donna_result.scalar_one_or_none()
-        if last_donna:
-            context["minutes_since_last_message"] = round(
-                (now - last_donna).total_seconds() / 60, 1
-            )
-        else:
-            context["minutes_since_last_message"] = None
+        return result.scalar_one_or_none()
 
-        # ── Memory facts ─────────────────────────────────────────────
-        facts_result = await session.execute(
-            select(MemoryFact)
+
+async def _load_memory_facts(user_id: str) -> list[Row]:
+    async with background_session() as session:
+        result = await session.execute(
+            select(MemoryFact.fact, MemoryFact.category)
             .where(MemoryFact.user_id == user_id)
             .order_by(MemoryFact.created_at.desc())
             .limit(20)
         )
-        facts = facts_result.scalars().all()
-        context["memory_facts"] = [
-            {"fact": f.fact, "category": f.category}
-            for f in facts
-        ]
-
-        # ── Pending tasks ────────────────────────────────────────────
-        tasks_result = await session.execute(
-            select(Task)
+        return result.all()
+
+
+async def _load_pending_tasks(user_id: str) -> list[Row]:
+    async with background_session() as session:
+        result = await session.execute(
+            select(Task.title, Task.due_date, Task.priority, Task.source)
             .where(Task.user_id == user_id, Task.status == "pending")
             .order_by(Task.due_date.asc().nullslast())
             .limit(15)
         )
-        tasks = tasks_result.scalars().all()
-        context["pending_tasks"] = [
-            {
-                "title": t.title,
-                "due_date": t.due_date.isoformat() if t.due_date else None,
-                "priority": t.priority,
-                "source": t.source,
-            }
-            for t in tasks
-        ]
-
-        # ── Recent mood ──────────────────────────────────────────────
-        seven_days_ago = now - timedelta(days=7)
-        mood_result = await session.execute(
-            select(MoodLog)
-            .where(MoodLog.user_id == user_id, MoodLog.created_at >= seven_days_ago)
+        return result.all()
+
+
+async def _load_recent_moods(user_id: str, since: datetime) -> list[Row]:
+    async with background_session() as session:
+        result = await session.execute(
+            select(MoodLog.score, MoodLog.note, MoodLog.created_at)
+            .where(MoodLog.user_id == user_id, MoodLog.created_at >= since)
             .order_by(MoodLog.created_at.desc())
         )
-        moods = mood_result.scalars().all()
-        context["recent_moods"] = [
-            {"score": m.score, "note": m.note, "date": m.created_at.isoformat()}
-            for m in moods
-        ]
-
-        # ── Today's spending ─────────────────────────────────────────
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        expense_result = await session.execute(
-            select(Expense)
-            .where(Expense.user_id == user_id, Expense.created_at >= today_start)
+        return result.all()
+
+
+async def _load_spending(user_id: str, since: datetime) -> float:
+    """Total spent since `since`, summed in SQL rather than over hydrated rows."""
+    async with background_session() as session:
+        result = await session.execute(
+            select(func.coalesce(func.sum(Expense.amount), 0))
+            .where(Expense.user_id == user_id, Expense.created_at >= since)
         )
-        expenses = expense_result.scalars().all()
-        context["today_spending"] = round(sum(e.amount for e in expenses), 2)
+        return float(result.scalar_one())
+
 
-    # ── Daily proactive message count ─────────────────────────────
+async def _count_proactive_safe(user_id: str, now: datetime) -> int:
     try:
-        context["proactive_sent_today"] = await count_proactive_today(user_id)
+        return await count_proactive_today(user_id, now=now)
     except Exception:
         logger.exception("Failed to count proactive messages for user %s", user_id)
-        context["proactive_sent_today"] = 0
+        return 0
+
+
+async def _load_db_sections(user_id: str, now: datetime) -> tuple:
+    """Run every independent loader concurrently.
+
+    Wall time is the slowest query, not the sum.
+    """
+    seven_days_ago = now - timedelta(days=7)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    return await asyncio.gather(
+        _load_user(user_id),
+        _load_history(user_id),
+        _load_memory_facts(user_id),
+        _load_pending_tasks(user_id),
+        _load_recent_moods(user_id, seven_days_ago),
+        _load_spending(user_id, today_start),
+        _count_proactive_safe(user_id, now),
+    )
+
+
+def _cached_sections(user_id: str) -> tuple | None:
+    cached = _db_sections_cache.get(user_id)
+    if cached is None:
+        return None
+    if time.monotonic() - cached[0] >= _DB_SECTIONS_TTL_SECONDS:
+        del _db_sections_cache[user_id]
+        return None
+    return cached[1]
+
+
+def _store_sections(user_id: str, sections: tuple) -> None:
+    stored_at = time.monotonic()
+    _db_sections_cache[user_id] = (stored_at, sections)
+    _db_sections_cache.move_to_end(user_id)
+    while True:
+        oldest_at, _ = next(iter(_db_sections_cache.values()))
+        if stored_at - oldest_at < _DB_SECTIONS_TTL_SECONDS:
+            break
+        _db_sections_cache.popitem(last=False)
+
+
+async def _load_db_sections_coalesced(user_id: str, now: datetime) -> tuple:
+    """_load_db_sections, shared across calls for the same user within the TTL.
+
+    The per-user lock makes concurrent callers wait for the first one's
+    reads instead of issuing their own.
+    """
+    sections = _cached_sections(user_id)
+    if sections is not None:
+        return sections
+
+    lock = _db_sections_locks[user_id]
+    try:
+        async with lock:
+            sections = _cached_sections(user_id)
+            if sections is None:
+                sections = await _load_db_sections(user_id, now)
+                _store_sections(user_id, sections)
+            return sections
+    finally:
+        # A waiter woken by this release still holds its own reference and
+        # finds the fresh cache entry, so the lock can go once it's free.
+        if not lock.locked() and _db_sections_locks.get(user_id) is lock:
+            del _db_sections_locks[user_id]
+
+
+def invalidate_context_cache(user_id: str) -> None:
+    """Drop a user's cached DB reads, e.g. after Donna messages them."""
+    _db_sections_cache.pop(user_id, None)
+
+
+def _local(dt: datetime, tz: tzinfo) -> datetime:
+    """A naive-UTC DB timestamp in the user's zone.
+
+    Every time the LLM sees carries the same offset as current_time, so
+    "how long ago" and "due today" are judged on one clock.
+    """
+    return dt.replace(tzinfo=UTC).astimezone(tz)
+
+
+async def build_context(
+    user_id: str, signals: list[Signal], now: datetime | None = None,
+) -> dict:
+    """Build a complete context window for the brain's LLM call.
+
+    Returns a dict with everything Donna needs to decide what to say:
+    - user profile
+    - current signals
+    - recent conversation
+    - memory facts
+    - pending tasks
+    - recent mood
+    - today's spending
+    - current time info
+
+    `now` defaults to the current naive-UTC time when not supplied by the caller.
+    DB windows use it as-is; the time shown to the LLM is the user's local time.
+    """
+    if now is None:
+        now = datetime.now(UTC).replace(tzinfo=None)
+
+    context: dict = {"user_id": user_id}
+
+    # Signals (the reason we're considering messaging)
+    context["signals"] = [
+        {"type": s.type.value, "data": s.data, "urgency_hint": s.urgency_hint}
+        for s in signals
+    ]
+
+    (
+        user, history, facts, tasks, moods, today_spending, proactive_sent_today,
+    ) = await _load_db_sections_coalesced(user_id, now)
+
+    # ── Current time (user's local time, offset included) ────────────
+    tz = user_zone(user.timezone or "UTC") if user else UTC
+    now_local = _local(now, tz)
+    context["current_time"] = now_local.isoformat()
+    context["day_of_week"] = now_local.strftime("%A")
+
+    # ── User profile ─────────────────────────────────────────────────
+    if not user:
+        return context
+
+    context["user"] = {
+        "name": user.name or "",
+        "timezone": user.timezone or "UTC",
+        "wake_time": user.wake_time or "08:00",
+        "sleep_time": user.sleep_time or "23:00",
+        "reminder_frequency": user.reminder_frequency or "normal",
+        "tone_preference": user.tone_preference or "casual",
+    }
+
+    # ── Recent conversation (last 10 messages) ───────────────────────
+    context["recent_conversation"] = [
+        {
+            "role": m.role,
+            "content": m.content,
+            "time": _local(m.created_at, tz).isoformat(),
+        }
+        for m in reversed(history)
+    ]
+
+    # ── Last assistant message time (for cooldown checks) ────────────
+    # Usually already in the history we just loaded. A short history is the user's
+    # whole conversation, so only a full page without one needs the extra query.
+    last_donna = next((m.created_at for m in history if m.role == "assistant"), None)
+    if last_donna is None and len(history) == _HISTORY_LIMIT:
+        last_donna = await _load_last_assistant_time(user_id)
+    if last_donna:
+        context["minutes_since_last_message"] = round(
+            (now - last_donna).total_seconds() / 60, 1
+        )
+    else:
+        context["minutes_since_last_message"] = None
+
+    # ── Memory facts ─────────────────────────────────────────────────
+    context["memory_facts"] = [
+        {"fact": f.fact, "category": f.category}
+        for f in facts
+    ]
+
+    # ── Pending tasks ────────────────────────────────────────────────
+    context["pending_tasks"] = [
+        {
+            "title": t.title,
+            "due_date": _local(t.due_date, tz).isoformat() if t.due_date else None,
+            "priority": t.priority,
+            "source": t.source,
+        }
+        for t in tasks
+    ]
+
+    # ── Recent mood ──────────────────────────────────────────────────
+    context["recent_moods"] = [
+        {"score": m.score, "note": m.note, "date": _local(m.created_at, tz).isoformat()}
+        for m in moods
+    ]
+
+    # ── Today's spending ─────────────────────────────────────────────
+    context["today_spending"] = round(today_spending, 2)
+
+    # ── Daily proactive message count ────────────────────────────────
+    context["proactive_sent_today"] = proactive_sent_today
+
+    # ── Recalled memories (semantic search) ──────────────────────────
+    # Runs after the gather: its LLM query generation reads the signals and
+    # recent conversation assembled above. An empty fact store can't match
+    # anything, so skip the LLM call outright.
+    if not facts:
+        context["recalled_memories"] = []
+        return context
 
-    # ── Recalled memories (semantic search) ─────────────────────────
     try:
         recalled = await recall_relevant_memories(user_id, context)
         context["recalled_memories"] = recalled
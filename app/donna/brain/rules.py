@@ -1,8 +1,11 @@
 """Scorer and filter — applies hard rules and soft scoring to candidates."""
 
+import functools
+import heapq
 import logging
+import time
 import zoneinfo
-from datetime import datetime, timezone
+from datetime import UTC, datetime, tzinfo
 
 from sqlalchemy import select, func
 
@@ -22,15 +25,35 @@ COOLDOWN_MINUTES = 30          # min gap between proactive messages
 MAX_PROACTIVE_PER_DAY = 4      # max proactive messages per day
 URGENT_SCORE_OVERRIDE = 8.5    # bypass cooldown if score is this high
 
+# Daily proactive counts change only when Donna sends, so they're cached
+# in-process and bumped by the sender. The TTL bounds drift from sends made
+# by another process.
+PROACTIVE_COUNT_TTL_SECONDS = 300
+
+# user_id → (today_start, count, fetched_at monotonic)
+_proactive_count_cache: dict[str, tuple[datetime, int, float]] = {}
+
+
+@functools.cache
+def user_zone(tz_name: str) -> tzinfo:
+    """Resolve a user's timezone name, falling back to UTC; cached per name."""
+    try:
+        return zoneinfo.ZoneInfo(tz_name)
+    except (KeyError, ValueError, zoneinfo.ZoneInfoNotFoundError):
+        return UTC
+
+
+# Each tick re-reads a user's last few messages, so the same assistant texts
+# come back run after run; bounded because message text is unbounded.
+@functools.lru_cache(maxsize=4096)
+def _word_set(text: str) -> frozenset[str]:
+    """Lowercased word set of a message, as the dedup compares them."""
+    return frozenset(text.lower().split())
+
 
 def _get_local_hour(user: dict) -> int:
     """Get current hour in the user's timezone."""
-    tz_name = user.get("timezone", "UTC")
-    try:
-        tz = zoneinfo.ZoneInfo(tz_name)
-    except (KeyError, zoneinfo.ZoneInfoNotFoundError):
-        tz = timezone.utc
-    return datetime.now(tz).hour
+    return datetime.now(user_zone(user.get("timezone", "UTC"))).hour
 
 
 def score_and_filter(candidates: list[dict], context: dict) -> list[dict]:
@@ -62,10 +85,13 @@ def score_and_filter(candidates: list[dict], context: dict) -> list[dict]:
     sent_today = context.get("proactive_sent_today", 0)
 
     # ── Recent assistant messages for dedup ─────────────────────────
-    recent_messages = [
-        m["content"].lower()
+    # Tokenized once here rather than once per candidate, and cached across
+    # runs; empty messages can never overlap, so they're dropped up front.
+    recent_word_sets = [
+        words
         for m in context.get("recent_conversation", [])
         if m.get("role") == "assistant"
+        if (words := _word_set(m["content"]))
     ]
 
     scored: list[dict] = []
@@ -103,14 +129,16 @@ def score_and_filter(candidates: list[dict], context: dict) -> list[dict]:
                 continue
 
         # ── Filter: dedup (skip if similar to recent assistant message) ──
-        candidate_lower = candidate["message"].lower()
-        candidate_words = set(candidate_lower.split())
+        # An empty candidate can't overlap anything, so it skips the loop entirely
+        candidate_words = frozenset(candidate["message"].lower().split())
+        candidate_size = len(candidate_words)
         is_duplicate = False
-        for recent in recent_messages:
-            recent_words = set(recent.split())
-            if not candidate_words or not recent_words:
+        for recent_words in recent_word_sets if candidate_size else ():
+            # Overlap is bounded by len(recent) / len(candidate); when that
+            # can't exceed 0.6 the intersection isn't worth computing
+            if len(recent_words) * 5 <= candidate_size * 3:
                 continue
-            overlap = len(candidate_words & recent_words) / max(len(candidate_words), 1)
+            overlap = len(candidate_words & recent_words) / candidate_size
             if overlap > 0.6:
                 logger.debug("Filtered (dedup %.0f%% overlap): %s", overlap * 100, candidate["message"][:50])
                 is_duplicate = True
@@ -120,12 +148,11 @@ def score_and_filter(candidates: list[dict], context: dict) -> list[dict]:
 
         scored.append(candidate)
 
-    # Sort by composite score descending
-    scored.sort(key=lambda c: c["composite_score"], reverse=True)
-
     # ── Hard rule: daily cap ─────────────────────────────────────────
+    # Only the top remaining_cap survive, so select them without a full sort.
+    # nlargest keeps sorted()'s order, ties included.
     remaining_cap = max(0, MAX_PROACTIVE_PER_DAY - sent_today)
-    scored = scored[:remaining_cap]
+    scored = heapq.nlargest(remaining_cap, scored, key=lambda c: c["composite_score"])
 
     if scored:
         logger.info(
@@ -139,11 +166,23 @@ def score_and_filter(candidates: list[dict], context: dict) -> list[dict]:
     return scored
 
 
-async def count_proactive_today(user_id: str) -> int:
-    """Count how many proactive (assistant) messages were sent today."""
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
+async def count_proactive_today(user_id: str, now: datetime | None = None) -> int:
+    """Count how many proactive (assistant) messages were sent today.
+
+    Served from a short-TTL in-process cache when possible.
+    """
+    if now is None:
+        now = datetime.now(UTC).replace(tzinfo=None)
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
+    cached = _proactive_count_cache.get(user_id)
+    if (
+        cached
+        and cached[0] == today_start
+        and time.monotonic() - cached[2] < PROACTIVE_COUNT_TTL_SECONDS
+    ):
+        return cached[1]
+
     async with async_session() as session:
         result = await session.execute(
             select(func.count(ChatMessage.id))
@@ -154,4 +193,21 @@ async def count_proactive_today(user_id: str) -> int:
                 ChatMessage.created_at >= today_start,
             )
         )
-        return result.scalar_one()
+        count = result.scalar_one()
+
+    _proactive_count_cache[user_id] = (today_start, count, time.monotonic())
+    return count
+
+
+def record_proactive_sent(user_id: str, now: datetime | None = None) -> None:
+    """Bump the cached daily count after a proactive message is persisted."""
+    if now is None:
+        now = datetime.now(UTC).replace(tzinfo=None)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    cached = _proactive_count_cache.get(user_id)
+    if cached and cached[0] == today_start:
+        _proactive_count_cache[user_id] = (today_start, cached[1] + 1, cached[2])
+    else:
+        # Nothing cached for today — the next count reads the DB
+        _proactive_count_cache.pop(user_id, None)
@@ -5,12 +5,14 @@ Routes through freeform text (inside 24h window) or pre-approved templates
 """
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import Exists, exists, select
 
 from db.models import ChatMessage, User, generate_uuid
 from db.session import async_session
+from donna.brain.context import invalidate_context_cache
+from donna.brain.rules import record_proactive_sent
 from tools.whatsapp import send_whatsapp_message, send_whatsapp_template
 
 logger = logging.getLogger(__name__)
@@ -37,22 +39,37 @@ TEMPLATES_WITH_BUTTONS = {
     "donna_task_reminder": ["done", "snooze"],
 }
 
+# Number of {{N}} variables each template expects
+TEMPLATE_VAR_COUNTS = {
+    "donna_deadline_v2": 2,    # assignment, due time
+    "donna_grade_alert": 2,    # course, score
+    "donna_schedule": 2,       # event, time+location
+    "donna_daily_digest": 1,   # formatted schedule
+    "donna_study_nudge": 1,    # suggestion
+    "donna_email_alert": 1,    # summary
+    "donna_check_in": 1,       # context
+    "donna_task_reminder": 1,  # task description
+}
 
-async def _is_window_open(user_id: str) -> bool:
-    """Check if the user messaged within the last 24 hours (WhatsApp service window)."""
-    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=24)
-    async with async_session() as session:
-        result = await session.execute(
-            select(ChatMessage.created_at)
-            .where(
-                ChatMessage.user_id == user_id,
-                ChatMessage.role == "user",
-                ChatMessage.created_at >= cutoff,
-            )
-            .order_by(ChatMessage.created_at.desc())
-            .limit(1)
-        )
-        return result.scalar_one_or_none() is not None
+# category → (template name, button payloads), resolved once at import
+_DEFAULT_TEMPLATE = ("donna_check_in", TEMPLATES_WITH_BUTTONS.get("donna_check_in"))
+_CATEGORY_TEMPLATES = {
+    category: (template_name, TEMPLATES_WITH_BUTTONS.get(template_name))
+    for category, template_name in CATEGORY_TEMPLATE_MAP.items()
+}
+
+
+def _window_open_clause(user_id: str) -> Exists:
+    """EXISTS over the user's messages in the last 24 hours (WhatsApp service window).
+
+    Only existence matters: no ordering, and the first index hit ends the scan.
+    """
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=24)
+    return exists().where(
+        ChatMessage.user_id == user_id,
+        ChatMessage.role == "user",
+        ChatMessage.created_at >= cutoff,
+    )
 
 
 def _extract_template_params(candidate: dict, template_name: str) -> list[str]:
@@ -62,20 +79,7 @@ def _extract_template_params(candidate: dict, template_name: str) -> list[str]:
     We split the LLM-generated message into that many parts.
     """
     msg = candidate["message"]
-
-    # Number of variables each template expects
-    var_counts = {
-        "donna_deadline_v2": 2,       # assignment, due time
-        "donna_grade_alert": 2,    # course, score
-        "donna_schedule": 2,       # event, time+location
-        "donna_daily_digest": 1,   # formatted schedule
-        "donna_study_nudge": 1,    # suggestion
-        "donna_email_alert": 1,    # summary
-        "donna_check_in": 1,       # context
-        "donna_task_reminder": 1,  # task description
-    }
-
-    expected = var_counts.get(template_name, 2)
+    expected = TEMPLATE_VAR_COUNTS.get(template_name, 2)
 
     if expected == 1:
         return [msg]
@@ -104,38 +108,44 @@ async def send_proactive_message(user_id: str, candidate: dict) -> bool:
 
     Returns True if sent successfully.
     """
+    # Phone and window state in one round-trip. This session closes before the
+    # WhatsApp call so a pool connection isn't held across the network send.
     async with async_session() as session:
-        user_result = await session.execute(select(User).where(User.id == user_id))
-        user = user_result.scalar_one_or_none()
+        result = await session.execute(
+            select(User.phone, _window_open_clause(user_id).label("window_open"))
+            .where(User.id == user_id)
+        )
+        row = result.one_or_none()
 
-    if not user or not user.phone:
+    phone, window_open = (row.phone, row.window_open) if row else (None, False)
+    if not phone:
         logger.warning("Cannot send proactive message: user %s not found or no phone", user_id)
         return False
 
     message_text = candidate["message"]
-    window_open = await _is_window_open(user_id)
 
     try:
         if window_open:
             # Inside 24h window — send freeform Donna-voice message
-            await send_whatsapp_message(to=user.phone, text=message_text)
+            await send_whatsapp_message(to=phone, text=message_text)
         else:
             # Outside 24h window — must use approved template
             category = candidate.get("category", "nudge")
-            template_name = CATEGORY_TEMPLATE_MAP.get(category, "donna_check_in")
+            template_name, button_payloads = _CATEGORY_TEMPLATES.get(category, _DEFAULT_TEMPLATE)
             params = _extract_template_params(candidate, template_name)
-            button_payloads = TEMPLATES_WITH_BUTTONS.get(template_name)
             await send_whatsapp_template(
-                to=user.phone,
+                to=phone,
                 template_name=template_name,
                 params=params,
                 button_payloads=button_payloads,
             )
     except Exception:
-        logger.exception("Failed to send proactive message to %s", user.phone)
+        logger.exception("Failed to send proactive message to %s", phone)
         return False
 
-    # Persist as assistant message in chat history
+    # Persist as assistant message in chat history. One timestamp for the row
+    # and the cached daily count, so both agree on which day it was sent.
+    sent_at = datetime.now(UTC).replace(tzinfo=None)
     async with async_session() as session:
         session.add(ChatMessage(
             id=generate_uuid(),
@@ -143,12 +153,15 @@ async def send_proactive_message(user_id: str, candidate: dict) -> bool:
             role="assistant",
             content=message_text,
             is_proactive=True,
+            created_at=sent_at,
         ))
         await session.commit()
+    record_proactive_sent(user_id, now=sent_at)
+    invalidate_context_cache(user_id)
 
     logger.info(
         "Sent proactive message to %s [%s] (score=%.1f, category=%s): %s",
-        user.phone,
+        phone,
         "freeform" if window_open else "template",
         candidate.get("composite_score", 0),
         candidate.get("category", "unknown"),
@@ -1,36 +1,55 @@
 """Main Donna loop — runs the full proactive pipeline for a single user."""
 
 import logging
+from datetime import datetime
 
 from donna.signals.collector import collect_all_signals
 from donna.brain.context import build_context
 from donna.brain.candidates import generate_candidates
-from donna.brain.rules import score_and_filter
+from donna.brain.rules import MAX_PROACTIVE_PER_DAY, count_proactive_today, score_and_filter
 from donna.brain.sender import send_proactive_message
 
 logger = logging.getLogger(__name__)
 
 
-async def donna_loop(user_id: str) -> int:
-    """Run one full proactive cycle for a user.
-
-    Pipeline: signals → context → LLM candidates → scoring/filter → send.
+async def prepare_context(
+    user_id: str, now: datetime | None = None, user_tz: str | None = None,
+) -> dict | None:
+    """Steps 1-2 of the pipeline: collect signals and build the LLM context.
 
-    Returns the number of messages actually sent.
+    `user_tz` is passed through to the signal collectors when already known.
+    Returns None when the daily cap is already reached or there are no signals,
+    so there is nothing to ask the LLM.
     """
+    # 0. Daily cap reached → score_and_filter would drop every candidate, so
+    #    skip collection, context and the LLM. The count is cached and
+    #    build_context reuses it. Quiet hours can't short-circuit here: an
+    #    urgent enough candidate still goes out.
+    try:
+        sent_today = await count_proactive_today(user_id, now=now)
+    except Exception:
+        logger.exception("Failed to count proactive messages for user %s", user_id)
+        sent_today = 0
+    if sent_today >= MAX_PROACTIVE_PER_DAY:
+        logger.debug("Daily cap reached for user %s — skipping run", user_id)
+        return None
+
     # 1. Collect signals (calendar, canvas, email, internal)
-    signals = await collect_all_signals(user_id)
+    signals = await collect_all_signals(user_id, user_tz=user_tz)
 
     if not signals:
         logger.debug("No signals for user %s — skipping brain", user_id)
-        return 0
+        return None
 
     # 2. Build context window for the LLM
-    context = await build_context(user_id, signals)
+    return await build_context(user_id, signals, now=now)
 
-    # 3. Generate candidate messages via LLM
-    candidates = await generate_candidates(context)
 
+async def deliver_candidates(user_id: str, context: dict, candidates: list[dict]) -> int:
+    """Steps 4-5 of the pipeline: score/filter the candidates and send the best.
+
+    Returns the number of messages actually sent.
+    """
     if not candidates:
         logger.debug("LLM returned no candidates for user %s", user_id)
         return 0
@@ -47,3 +66,26 @@ async def donna_loop(user_id: str) -> int:
     sent = await send_proactive_message(user_id, best)
 
     return 1 if sent else 0
+
+
+async def donna_loop(
+    user_id: str, now: datetime | None = None, user_tz: str | None = None,
+) -> int:
+    """Run one full proactive cycle for a user.
+
+    Pipeline: signals → context → LLM candidates → scoring/filter → send.
+
+    `now` is the naive-UTC tick time; the scheduler passes one value for
+    every user in a run so it is computed once per tick. `user_tz` is the
+    user's timezone when the caller already loaded it.
+
+    Returns the number of messages actually sent.
+    """
+    context = await prepare_context(user_id, now=now, user_tz=user_tz)
+    if context is None:
+        return 0
+
+    # 3. Generate candidate messages via LLM
+    candidates = await generate_candidates(context)
+
+    return await deliver_candidates(user_id, context, candidates)
@@ -32,6 +32,8 @@ Rules:
 
 Return ONLY a JSON array. No markdown, no explanation."""
 
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
 llm = ChatOpenAI(model="gpt-4o", api_key=settings.openai_api_key, temperature=0)
 
 
@@ -46,7 +48,7 @@ async def extract_entities(user_id: str, message: str) -> list[dict]:
 
     try:
         response = await llm.ainvoke([
-            SystemMessage(content=SYSTEM_PROMPT),
+            _SYSTEM_MESSAGE,
             HumanMessage(content=message),
         ])
     except Exception:
@@ -30,6 +30,8 @@ Only return patterns you're fairly confident about (>0.5). If there isn't enough
 
 Return ONLY a JSON array. No markdown, no explanation."""
 
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
 llm = ChatOpenAI(model="gpt-4o", api_key=settings.openai_api_key, temperature=0.3)
 
 MIN_MESSAGES_FOR_PATTERNS = 5
@@ -44,24 +46,24 @@ async def detect_patterns(user_id: str) -> list[dict]:
     async with async_session() as session:
         # Pull recent chat messages
         msg_result = await session.execute(
-            select(ChatMessage)
+            select(ChatMessage.role, ChatMessage.content, ChatMessage.created_at)
             .where(ChatMessage.user_id == user_id)
             .order_by(ChatMessage.created_at.desc())
             .limit(50)
         )
-        messages = msg_result.scalars().all()
+        messages = msg_result.all()
 
         if len(messages) < MIN_MESSAGES_FOR_PATTERNS:
             return []
 
         # Pull existing memory facts
         facts_result = await session.execute(
-            select(MemoryFact)
+            select(MemoryFact.fact, MemoryFact.category)
             .where(MemoryFact.user_id == user_id)
             .order_by(MemoryFact.created_at.desc())
             .limit(30)
         )
-        facts = facts_result.scalars().all()
+        facts = facts_result.all()
 
     # Build input for LLM
     messages_text = "\n".join(
@@ -74,7 +76,7 @@ async def detect_patterns(user_id: str) -> list[dict]:
 
     try:
         response = await llm.ainvoke([
-            SystemMessage(content=SYSTEM_PROMPT),
+            _SYSTEM_MESSAGE,
             HumanMessage(content=user_prompt),
         ])
     except Exception:
@@ -109,19 +111,21 @@ async def detect_patterns(user_id: str) -> list[dict]:
 
     # Store as MemoryFacts (skip duplicates by checking existing pattern facts)
     if valid:
+        fact_texts = [f"{p['pattern']}: {p['description']}" for p in valid]
         try:
             async with async_session() as session:
+                # Only look up the texts about to be written, not every stored pattern
                 existing_result = await session.execute(
                     select(MemoryFact.fact)
                     .where(
                         MemoryFact.user_id == user_id,
                         MemoryFact.category == "pattern",
+                        MemoryFact.fact.in_(fact_texts),
                     )
                 )
-                existing_facts = {row[0] for row in existing_result.all()}
+                existing_facts = set(existing_result.scalars().all())
 
-                for p in valid:
-                    fact_text = f"{p['pattern']}: {p['description']}"
+                for p, fact_text in zip(valid, fact_texts):
                     if fact_text not in existing_facts:
                         session.add(MemoryFact(
                             id=generate_uuid(),
@@ -1,12 +1,12 @@
 """Semantic memory recall — finds relevant memories for the current context."""
 
-import json
 import logging
 from datetime import datetime, timezone
 
+import orjson
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from config import settings
 from db.models import MemoryFact
@@ -18,11 +18,19 @@ QUERY_GEN_PROMPT = """Given the current signals and recent conversation below, s
 search keywords or phrases to look up in the user's memory. These should help find past mentions
 of people, places, events, or preferences that might be relevant right now.
 
-Return ONLY a JSON array of strings. No markdown, no explanation.
+Return ONLY a JSON object with a "queries" array of strings. No markdown, no explanation.
 
-Example: ["restaurant", "noor birthday", "gym", "SE assignment"]"""
+Example: {"queries": ["restaurant", "noor birthday", "gym", "SE assignment"]}"""
 
-llm = ChatOpenAI(model="gpt-4o", api_key=settings.openai_api_key, temperature=0)
+_QUERY_GEN_MESSAGE = SystemMessage(content=QUERY_GEN_PROMPT)
+
+# JSON mode guarantees a parseable object root, so no markdown-fence handling is needed
+llm = ChatOpenAI(
+    model="gpt-4o",
+    api_key=settings.openai_api_key,
+    temperature=0,
+    model_kwargs={"response_format": {"type": "json_object"}},
+)
 
 
 async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10) -> list[dict]:
@@ -34,8 +42,10 @@ async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10)
     Returns list of relevant memory facts with their metadata.
     """
     # Build a summary of current context for the LLM
-    signals_summary = json.dumps(context.get("signals", []), default=str)
-    conversation_summary = json.dumps(context.get("recent_conversation", [])[-5:], default=str)
+    signals_summary = orjson.dumps(context.get("signals", []), default=str).decode()
+    conversation_summary = orjson.dumps(
+        context.get("recent_conversation", [])[-5:], default=str,
+    ).decode()
 
     context_text = (
         f"Current signals:\n{signals_summary}\n\n"
@@ -46,26 +56,24 @@ async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10)
     # Ask LLM for search queries
     try:
         response = await llm.ainvoke([
-            SystemMessage(content=QUERY_GEN_PROMPT),
+            _QUERY_GEN_MESSAGE,
             HumanMessage(content=context_text),
         ])
     except Exception:
         logger.exception("LLM call failed in memory recall query generation")
         return []
 
-    raw = response.content.strip()
-    if raw.startswith("```"):
-        raw = raw.split("\n", 1)[1] if "\n" in raw else raw[3:]
-        if raw.endswith("```"):
-            raw = raw[:-3]
-        raw = raw.strip()
+    raw = response.content
 
     try:
-        queries = json.loads(raw)
-    except json.JSONDecodeError:
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         logger.error("Failed to parse recall queries: %s", raw[:200])
         return []
 
+    # JSON mode returns {"queries": [...]}; tolerate a bare array as well
+    queries = parsed.get("queries", []) if isinstance(parsed, dict) else parsed
+
     if not isinstance(queries, list) or not queries:
         return []
 
@@ -78,8 +86,12 @@ async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10)
             if not isinstance(query, str) or not query.strip():
                 continue
 
+            # Only the reported columns — full objects would drag the embedding along
             fact_result = await session.execute(
-                select(MemoryFact)
+                select(
+                    MemoryFact.id, MemoryFact.fact, MemoryFact.category,
+                    MemoryFact.confidence, MemoryFact.created_at,
+                )
                 .where(
                     MemoryFact.user_id == user_id,
                     MemoryFact.fact.ilike(f"%{query.strip()}%"),
@@ -87,9 +99,7 @@ async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10)
                 .order_by(MemoryFact.created_at.desc())
                 .limit(5)
             )
-            facts = fact_result.scalars().all()
-
-            for f in facts:
+            for f in fact_result.all():
                 if f.id not in seen_ids:
                     seen_ids.add(f.id)
                     results.append({
@@ -102,15 +112,11 @@ async def recall_relevant_memories(user_id: str, context: dict, limit: int = 10)
         # Update last_referenced on recalled facts
         if seen_ids:
             now = datetime.now(timezone.utc).replace(tzinfo=None)
-            for fact_id in seen_ids:
-                await session.execute(
-                    select(MemoryFact).where(MemoryFact.id == fact_id)
-                )
-            # Bulk update via individual loads
-            for fact_id in seen_ids:
-                fact_obj = await session.get(MemoryFact, fact_id)
-                if fact_obj:
-                    fact_obj.last_referenced = now
+            await session.execute(
+                update(MemoryFact)
+                .where(MemoryFact.id.in_(seen_ids))
+                .values(last_referenced=now)
+            )
             await session.commit()
 
     logger.info(
@@ -1,9 +1,9 @@
 """Calendar signal collector — polls Google Calendar or Outlook via Composio."""
 
 import logging
-import zoneinfo
 from datetime import datetime, timezone
 
+from donna.brain.rules import user_zone
 from donna.signals.base import Signal, SignalType
 from tools.calendar import get_calendar_events
 from tools.composio_client import get_email_provider
@@ -18,12 +18,8 @@ async def collect_calendar_signals(user_id: str, user_tz: str = "UTC") -> list[S
         return []
     source = "outlook_calendar" if provider == "microsoft" else "google_calendar"
 
-    try:
-        tz = zoneinfo.ZoneInfo(user_tz)
-    except (KeyError, zoneinfo.ZoneInfoNotFoundError):
-        tz = timezone.utc
-    local_now = datetime.now(tz)
     now = datetime.now(timezone.utc)
+    local_now = now.astimezone(user_zone(user_tz))
     signals: list[Signal] = []
 
     # Fetch today's events using user-local date
@@ -51,7 +47,8 @@ async def collect_calendar_signals(user_id: str, user_tz: str = "UTC") -> list[S
             source=source,
         ))
 
-    # ── Approaching events (within next 60 min) ─────────────────────────
+    # Parse each event's times once; both passes below reuse them
+    parsed_events: list[tuple[dict, str, datetime, datetime | None]] = []
     for event in today_events:
         start_str = event.get("start", "")
         if not start_str:
@@ -60,7 +57,15 @@ async def collect_calendar_signals(user_id: str, user_tz: str = "UTC") -> list[S
             start_dt = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
         except ValueError:
             continue
+        end_str = event.get("end", "")
+        try:
+            end_dt = datetime.fromisoformat(end_str.replace("Z", "+00:00")) if end_str else None
+        except ValueError:
+            end_dt = None
+        parsed_events.append((event, start_str, start_dt, end_dt))
 
+    # ── Approaching events (within next 60 min) ─────────────────────────
+    for event, start_str, start_dt, _ in parsed_events:
         minutes_away = (start_dt - now).total_seconds() / 60
 
         if 0 < minutes_away <= 60:
@@ -88,19 +93,11 @@ async def collect_calendar_signals(user_id: str, user_tz: str = "UTC") -> list[S
             ))
 
     # ── Free time gaps (>= 2 hours in remaining day) ────────────────────
-    remaining_events = []
-    for event in today_events:
-        start_str = event.get("start", "")
-        end_str = event.get("end", "")
-        if not start_str or not end_str:
-            continue
-        try:
-            s = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-            e = datetime.fromisoformat(end_str.replace("Z", "+00:00"))
-            if e > now:  # only future/ongoing events
-                remaining_events.append((s, e))
-        except ValueError:
-            continue
+    remaining_events = [
+        (start_dt, end_dt)
+        for _, _, start_dt, end_dt in parsed_events
+        if end_dt is not None and end_dt > now  # only future/ongoing events
+    ]
 
     remaining_events.sort(key=lambda x: x[0])
 
@@ -1,5 +1,6 @@
 """Canvas signal collector — checks assignments and deadlines."""
 
+import bisect
 import logging
 from datetime import datetime, timezone
 
@@ -16,6 +17,8 @@ _DEADLINE_THRESHOLDS = [
     (48, "2_days"),
     (72, "3_days"),
 ]
+# Sorted threshold hours, so the tightest one is a bisect rather than a scan
+_THRESHOLD_HOURS = [hours for hours, _ in _DEADLINE_THRESHOLDS]
 
 
 async def collect_canvas_signals(user_id: str) -> list[Signal]:
@@ -60,22 +63,22 @@ async def collect_canvas_signals(user_id: str) -> list[Signal]:
 
         # ── Approaching deadline (not submitted) ─────────────────────
         if not submitted and hours_until > 0:
-            for threshold_hours, label in _DEADLINE_THRESHOLDS:
-                if hours_until <= threshold_hours:
-                    signals.append(Signal(
-                        type=SignalType.CANVAS_DEADLINE_APPROACHING,
-                        user_id=user_id,
-                        data={
-                            "title": assignment.get("title", ""),
-                            "course": assignment.get("course", ""),
-                            "due_date": due_str,
-                            "hours_until": round(hours_until, 1),
-                            "urgency_label": label,
-                            "points": assignment.get("points"),
-                        },
-                        source="canvas",
-                    ))
-                    break  # only emit the tightest threshold
+            # Only emit the tightest threshold the deadline falls within
+            idx = bisect.bisect_left(_THRESHOLD_HOURS, hours_until)
+            if idx < len(_DEADLINE_THRESHOLDS):
+                signals.append(Signal(
+                    type=SignalType.CANVAS_DEADLINE_APPROACHING,
+                    user_id=user_id,
+                    data={
+                        "title": assignment.get("title", ""),
+                        "course": assignment.get("course", ""),
+                        "due_date": due_str,
+                        "hours_until": round(hours_until, 1),
+                        "urgency_label": _DEADLINE_THRESHOLDS[idx][1],
+                        "points": assignment.get("points"),
+                    },
+                    source="canvas",
+                ))
 
     # ── Recently graded assignments ──────────────────────────────
     try:
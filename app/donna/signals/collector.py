@@ -1,6 +1,7 @@
 """Signal aggregator — runs all collectors for a user and returns combined signals."""
 
 import asyncio
+import heapq
 import logging
 
 from sqlalchemy import select
@@ -20,16 +21,20 @@ logger = logging.getLogger(__name__)
 _MAX_SIGNALS = 10
 
 
-async def collect_all_signals(user_id: str) -> list[Signal]:
+async def collect_all_signals(user_id: str, user_tz: str | None = None) -> list[Signal]:
     """Run all signal collectors concurrently and return combined results.
 
     Collectors that fail (e.g. integration not connected) return empty lists
     and don't block other collectors.
+
+    Callers that already hold the user's timezone (the scheduler reads it with
+    the user list) pass `user_tz` to skip the lookup round-trip.
     """
-    # Look up user timezone
-    async with async_session() as session:
-        result = await session.execute(select(User.timezone).where(User.id == user_id))
-        user_tz = result.scalar_one_or_none() or "UTC"
+    if user_tz is None:
+        async with async_session() as session:
+            result = await session.execute(select(User.timezone).where(User.id == user_id))
+            user_tz = result.scalar_one_or_none()
+    user_tz = user_tz or "UTC"
 
     collectors = [
         ("calendar", collect_calendar_signals, (user_id, user_tz)),
@@ -57,16 +62,15 @@ async def collect_all_signals(user_id: str) -> list[Signal]:
     # Cross-signal enrichment
     all_signals = enrich_signals(all_signals)
 
-    # Sort by urgency hint descending so the brain sees high-urgency first
-    all_signals.sort(key=lambda s: s.urgency_hint, reverse=True)
-
-    # Cap output
+    # Keep the _MAX_SIGNALS most urgent, highest first, so the brain sees
+    # high-urgency first. nlargest matches a stable descending sort + slice
+    # without ordering the signals that get dropped.
     if len(all_signals) > _MAX_SIGNALS:
         logger.info(
             "Truncating signals from %d to %d for user %s",
             len(all_signals), _MAX_SIGNALS, user_id,
         )
-        all_signals = all_signals[:_MAX_SIGNALS]
+    all_signals = heapq.nlargest(_MAX_SIGNALS, all_signals, key=lambda s: s.urgency_hint)
 
     logger.info(
         "Collected %d signals for user %s: %s",
@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from db.models import SignalState, generate_uuid
 from db.session import async_session
@@ -38,11 +38,10 @@ _REEMIT_HOURS: dict[str, float] = {
 _DEFAULT_REEMIT_HOURS = 12
 
 
-def _should_reemit(signal: Signal, state: SignalState) -> bool:
-    """Return True if enough time has passed to re-emit this signal."""
+def _should_reemit(signal: Signal, state: SignalState, now: datetime) -> bool:
+    """Return True if enough time has passed since `state.last_seen` to re-emit this signal."""
     reemit_hours = _REEMIT_HOURS.get(signal.type.value, _DEFAULT_REEMIT_HOURS)
     threshold = state.last_seen + timedelta(hours=reemit_hours)
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
     return now >= threshold
 
 
@@ -68,14 +67,15 @@ async def deduplicate_signals(user_id: str, signals: list[Signal]) -> list[Signa
     async with async_session() as session:
         # Fetch all existing states for this user in one query
         result = await session.execute(
-            select(SignalState).where(
+            select(SignalState.id, SignalState.dedup_key, SignalState.last_seen).where(
                 SignalState.user_id == user_id,
                 SignalState.dedup_key.in_(dedup_keys),
             )
         )
-        existing_states = {state.dedup_key: state for state in result.scalars().all()}
+        existing_states = {state.dedup_key: state for state in result.all()}
 
         emitted: list[Signal] = []
+        seen_again: list[str] = []
         now = datetime.now(timezone.utc).replace(tzinfo=None)
 
         for sig in signals:
@@ -94,12 +94,17 @@ async def deduplicate_signals(user_id: str, signals: list[Signal]) -> list[Signa
                 ))
                 emitted.append(sig)
             else:
-                # Update tracking regardless
-                state.last_seen = now
-                state.times_seen += 1
-
-                if _should_reemit(sig, state):
+                if _should_reemit(sig, state, now):
                     emitted.append(sig)
+                # Update tracking regardless (below, in one statement)
+                seen_again.append(state.id)
+
+        if seen_again:
+            await session.execute(
+                update(SignalState)
+                .where(SignalState.id.in_(seen_again))
+                .values(last_seen=now, times_seen=SignalState.times_seen + 1)
+            )
 
         await session.commit()
 
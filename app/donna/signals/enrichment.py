@@ -16,20 +16,21 @@ def enrich_signals(signals: list[Signal]) -> list[Signal]:
     if not signals:
         return signals
 
-    types = {s.type for s in signals}
+    # One pass groups the signals; its keys double as the set of present types
     by_type: dict[SignalType, list[Signal]] = {}
     for s in signals:
         by_type.setdefault(s.type, []).append(s)
 
-    # ── Pattern 1: Calendar gap + Canvas deadline → study suggestion ──
+    # The longest gap feeds both patterns 1 and 4, so pick it once
     gaps = by_type.get(SignalType.CALENDAR_GAP_DETECTED, [])
+    best_gap = max(gaps, key=lambda s: s.data.get("duration_hours", 0)) if gaps else None
+
+    # ── Pattern 1: Calendar gap + Canvas deadline → study suggestion ──
     deadlines = by_type.get(SignalType.CANVAS_DEADLINE_APPROACHING, [])
 
-    if gaps and deadlines:
+    if best_gap is not None and deadlines:
         # Pick the most urgent deadline
         closest = min(deadlines, key=lambda s: s.data.get("hours_until", 999))
-        # Pick the longest gap
-        best_gap = max(gaps, key=lambda s: s.data.get("duration_hours", 0))
         best_gap.data["suggested_task"] = closest.data.get("title", "")
         best_gap.data["suggested_course"] = closest.data.get("course", "")
         logger.debug(
@@ -38,21 +39,20 @@ def enrich_signals(signals: list[Signal]) -> list[Signal]:
         )
 
     # ── Pattern 2: Mood down + busy day → care escalation ────────────
-    if SignalType.MOOD_TREND_DOWN in types and SignalType.CALENDAR_BUSY_DAY in types:
+    if SignalType.MOOD_TREND_DOWN in by_type and SignalType.CALENDAR_BUSY_DAY in by_type:
         for mood_sig in by_type[SignalType.MOOD_TREND_DOWN]:
             mood_sig.data["care_escalation"] = True
         logger.debug("Enrichment: mood-down + busy-day → care escalation")
 
     # ── Pattern 3: Habit at risk + evening window → bedtime reminder ──
-    if SignalType.HABIT_STREAK_AT_RISK in types and SignalType.TIME_EVENING_WINDOW in types:
+    if SignalType.HABIT_STREAK_AT_RISK in by_type and SignalType.TIME_EVENING_WINDOW in by_type:
         for habit_sig in by_type[SignalType.HABIT_STREAK_AT_RISK]:
             habit_sig.data["bedtime_reminder"] = True
         logger.debug("Enrichment: habit-at-risk + evening → bedtime reminder hint")
 
     # ── Pattern 4: Task due today + calendar gap → scheduling hint ────
     tasks_due = by_type.get(SignalType.TASK_DUE_TODAY, [])
-    if tasks_due and gaps:
-        best_gap = max(gaps, key=lambda s: s.data.get("duration_hours", 0))
+    if tasks_due and best_gap is not None:
         for task_sig in tasks_due:
             task_sig.data["scheduling_hint"] = {
                 "gap_start": best_gap.data.get("start", ""),
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""(Re)build the embedding vector indexes sized to each table's row count.
+
+Run from app/ after a deploy:
+    python scripts/build_vector_indexes.py            # apply
+    python scripts/build_vector_indexes.py --dry-run  # print the SQL only
+
+`db/models.py` declares HNSW indexes with the smallest tier of
+`HNSW_TIERS` so fresh databases get an index from `create_all()`. As
+tables grow, this script swaps each one for the type and parameters that
+suit its size:
+
+- < 100K rows  → HNSW, m=16, ef_construction=64
+- < 1M rows    → HNSW, m=24, ef_construction=100
+- ≥ 1M rows    → IVFFlat, lists=sqrt(n) (builds far faster, uses less memory)
+
+Indexes whose definition already matches are left alone, so re-running
+is cheap. Builds use CONCURRENTLY and don't block writes.
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import text
+
+from db.models import HNSW_TIERS, Base
+from db.session import engine
+
+OPCLASS = "halfvec_cosine_ops"
+
+
+def configure_vector_index(n: int) -> str:
+    """Return the `USING ... WITH (...)` clause for an embedding index over `n` rows.
+
+    Values are quoted the way Postgres echoes them back in pg_indexes.indexdef,
+    so the clause doubles as the "already up to date" check.
+    """
+    for max_rows, m, ef_construction in HNSW_TIERS:
+        if n < max_rows:
+            method, params = "hnsw", f"m='{m}', ef_construction='{ef_construction}'"
+            break
+    else:
+        method, params = "ivfflat", f"lists='{max(1, int(math.sqrt(n)))}'"
+    return f"USING {method} (embedding {OPCLASS}) WITH ({params})"
+
+
+def _embedding_indexes() -> list[tuple[str, str]]:
+    """Return (table, index_name) for every index declared on an embedding column."""
+    found = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if [c.name for c in index.columns] == ["embedding"]:
+                found.append((table.name, index.name))
+    return found
+
+
+async def main(dry_run: bool):
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        for table, index_name in _embedding_indexes():
+            n = (await conn.execute(
+                text(f'SELECT count(*) FROM "{table}" WHERE embedding IS NOT NULL')
+            )).scalar_one()
+            clause = configure_vector_index(n)
+
+            current = (await conn.execute(
+                text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"),
+                {"name": index_name},
+            )).scalar_one_or_none()
+            if current and clause in current:
+                print(f"   ✓ {index_name} ({n} rows) up to date")
+                continue
+
+            statements = [
+                f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"',
+                f'CREATE INDEX CONCURRENTLY "{index_name}" ON "{table}" {clause}',
+            ]
+            for stmt in statements:
+                print(f"   {stmt}")
+                if not dry_run:
+                    await conn.execute(text(stmt))
+
+    print("\nDone.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Create any B-tree index declared in the models but missing from the database.
+
+Run from app/ after a deploy:
+    python scripts/create_missing_indexes.py            # apply
+    python scripts/create_missing_indexes.py --dry-run  # print the SQL only
+
+`create_all()` only builds indexes together with their table, so
+databases created before an index was added to `db/models.py` never get
+it. This script creates each missing one with CONCURRENTLY, so writes
+aren't blocked. Embedding indexes are left to build_vector_indexes.py,
+which sizes them to the table.
+"""
+
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from db.models import Base
+from db.session import engine
+
+
+def _declared_indexes() -> list[tuple[str, str]]:
+    """Return (index_name, CREATE INDEX CONCURRENTLY statement) for non-embedding indexes."""
+    found = []
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if [c.name for c in index.columns] == ["embedding"]:
+                continue
+            ddl = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+            found.append((index.name, ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+    return found
+
+
+async def main(dry_run: bool):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        result = await conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = 'public'")
+        )
+        existing = {row[0] for row in result.all()}
+
+        created = 0
+        for index_name, stmt in _declared_indexes():
+            if index_name in existing:
+                print(f"   ✓ {index_name} exists")
+                continue
+            print(f"   {stmt}")
+            if not dry_run:
+                await conn.execute(text(stmt))
+            created += 1
+
+    print(f"\nDone. {created} index(es) {'would be ' if dry_run else ''}created.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Convert fp32 `vector(1536)` embedding columns to fp16 `halfvec(1536)`.
+
+Run from app/:
+    python scripts/migrate_halfvec_embeddings.py            # apply
+    python scripts/migrate_halfvec_embeddings.py --dry-run  # print the SQL only
+
+Requires pgvector >= 0.7 (halfvec support). Columns that are already
+halfvec are skipped, so it is safe to re-run. Drop any existing vector
+index on these columns first — `vector_*_ops` opclasses don't apply to
+halfvec — and rebuild it with the `halfvec_*_ops` equivalent afterwards.
+"""
+
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import text
+
+from db.session import engine
+
+EMBEDDING_TABLES = ["journal_entries", "voice_notes", "memory_facts"]
+
+
+async def main(dry_run: bool):
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            "SELECT table_name FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND column_name = 'embedding' "
+            "AND udt_name = 'vector'"
+        ))
+        pending = [row[0] for row in result.all() if row[0] in EMBEDDING_TABLES]
+
+        if not pending:
+            print("All embedding columns are already halfvec — nothing to do.")
+            return
+
+        for table in pending:
+            stmt = (
+                f'ALTER TABLE "{table}" ALTER COLUMN embedding '
+                f"TYPE halfvec(1536) USING embedding::halfvec(1536)"
+            )
+            print(f"   {stmt}")
+            if not dry_run:
+                await conn.execute(text(stmt))
+
+    print(f"\nDone. {len(pending)} column(s) {'would be ' if dry_run else ''}converted.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
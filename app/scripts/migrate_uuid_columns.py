@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Convert text UUID id columns to native Postgres `uuid`.
+
+Run from app/:
+    python scripts/migrate_uuid_columns.py            # apply
+    python scripts/migrate_uuid_columns.py --dry-run  # print the SQL only
+
+`create_all()` only builds missing tables, so databases created before the
+models switched to `UUIDString` still hold ids as varchar. This script
+drops the foreign keys on those columns, retypes every UUIDString column
+with `USING col::uuid`, and re-adds the foreign keys — all in one
+transaction. Constraint names and definitions are read from pg_constraint,
+so non-default names survive. Columns that are already `uuid` are skipped,
+so it is safe to re-run.
+
+Ordering: run this BEFORE deploying the UUIDString models. The models bind
+ids as uuid parameters, and until the columns are converted every id
+comparison fails with "operator does not exist: character varying = uuid".
+"""
+
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, ".")
+
+from sqlalchemy import text
+
+from db.models import Base, UUIDString
+from db.session import engine
+
+# Foreign keys touching a column on either side, with their real names and DDL
+_FOREIGN_KEYS_SQL = text("""
+    SELECT DISTINCT con.conname, rel.relname, pg_get_constraintdef(con.oid),
+           src.attname, ref.relname, dst.attname
+    FROM pg_constraint con
+    JOIN pg_class rel ON rel.oid = con.conrelid
+    JOIN pg_class ref ON ref.oid = con.confrelid
+    JOIN pg_namespace ns ON ns.oid = rel.relnamespace
+    JOIN pg_attribute src ON src.attrelid = con.conrelid AND src.attnum = ANY(con.conkey)
+    JOIN pg_attribute dst ON dst.attrelid = con.confrelid AND dst.attnum = ANY(con.confkey)
+    WHERE con.contype = 'f' AND ns.nspname = 'public'
+""")
+
+
+def _uuid_columns() -> list[tuple[str, str]]:
+    """Return (table, column) for every UUIDString column."""
+    return [
+        (table.name, col.name)
+        for table in Base.metadata.sorted_tables
+        for col in table.columns
+        if col.type is UUIDString
+    ]
+
+
+async def main(dry_run: bool):
+    columns = _uuid_columns()
+
+    async with engine.begin() as conn:
+        result = await conn.execute(text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND data_type = 'uuid'"
+        ))
+        already_uuid = {(row[0], row[1]) for row in result.all()}
+        pending = [c for c in columns if (c[0], c[1]) not in already_uuid]
+
+        if not pending:
+            print("All id columns are already uuid — nothing to do.")
+            return
+
+        # Any FK whose referencing or referenced column changes type must be
+        # dropped first. Keyed by (table, name), so each is dropped and re-added once.
+        pending_set = set(pending)
+        fks: dict[tuple[str, str], str] = {}
+        for name, table, definition, col, ref_table, ref_col in (
+            await conn.execute(_FOREIGN_KEYS_SQL)
+        ).all():
+            if (table, col) in pending_set or (ref_table, ref_col) in pending_set:
+                fks[(table, name)] = definition
+
+        statements = [
+            f'ALTER TABLE "{t}" DROP CONSTRAINT "{name}"' for t, name in fks
+        ]
+        statements += [
+            f'ALTER TABLE "{t}" ALTER COLUMN "{c}" TYPE uuid USING "{c}"::uuid'
+            for t, c in pending
+        ]
+        statements += [
+            f'ALTER TABLE "{t}" ADD CONSTRAINT "{name}" {definition}'
+            for (t, name), definition in fks.items()
+        ]
+
+        for stmt in statements:
+            print(f"   {stmt}")
+            if not dry_run:
+                await conn.execute(text(stmt))
+
+    print(f"\nDone. {len(pending)} column(s) {'would be ' if dry_run else ''}converted.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--dry-run", action="store_true", help="print SQL without executing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
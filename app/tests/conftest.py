@@ -5,9 +5,11 @@ Patches `async_session` in all modules that import it so production code
 transparently hits the test DB instead of Postgres.
 """
 
+import asyncio
 from datetime import datetime, timezone
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
+import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
@@ -22,6 +24,7 @@ from db.models import (
     User,
     generate_uuid,
 )
+from db.session import BACKGROUND_MAX_SESSIONS
 
 # All modules that do `from db.session import async_session`
 _MODULES_USING_SESSION = [
@@ -71,11 +74,47 @@ async def patch_async_session(db_engine):
             patches.append(p)
         except AttributeError:
             pass  # Module doesn't import async_session (yet)
+    # A fresh semaphore per test: a contended one binds to the event loop it waited on
+    slots = patch("db.session._background_slots", asyncio.Semaphore(BACKGROUND_MAX_SESSIONS))
+    slots.start()
+    patches.append(slots)
     yield factory
     for p in patches:
         p.stop()
 
 
+@pytest.fixture(autouse=True)
+def clear_donna_caches():
+    """Each test gets a fresh DB and event loop, so cached reads and locks must not leak."""
+    from donna.brain import candidates, context, rules
+    from tools import canvas, composio_client
+
+    caches = [
+        rules._proactive_count_cache,
+        context._db_sections_cache,
+        context._db_sections_locks,
+        candidates._empty_result_cache,
+        composio_client._connected_cache,
+        canvas._canvas_token_cache,
+    ]
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def patch_candidate_gate():
+    """Open the cheap candidate gate so tests exercise the mocked full model."""
+    from langchain_core.messages import AIMessage
+
+    gate = AsyncMock()
+    gate.ainvoke.return_value = AIMessage(content="YES")
+    with patch("donna.brain.candidates.gate_llm", gate):
+        yield gate
+
+
 # ── Factory helpers ────────────────────────────────────────────────────────
 
 def make_user(**overrides) -> User:
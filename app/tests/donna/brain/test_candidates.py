@@ -0,0 +1,126 @@
+"""Tests for donna.brain.candidates — LLM candidate generation."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from donna.brain import candidates as candidates_mod
+from donna.brain.candidates import generate_candidates
+
+
+def _response(content: str):
+    resp = MagicMock()
+    resp.content = content
+    return resp
+
+
+class TestEmptyResultCache:
+
+    def _ctx(self, signals=("calendar_gap_detected",), last_time="2025-06-15T10:00:00"):
+        return {
+            "user_id": "u1",
+            "signals": [{"type": t, "data": {}} for t in signals],
+            "recent_conversation": [{"role": "user", "content": "hi", "time": last_time}],
+        }
+
+    async def test_empty_answer_skips_repeat_call(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": []}')
+
+        with patch("donna.brain.candidates.llm", llm):
+            assert await generate_candidates(self._ctx()) == []
+            assert await generate_candidates(self._ctx()) == []
+
+        llm.ainvoke.assert_awaited_once()
+
+    async def test_new_inputs_call_llm_again(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": []}')
+
+        with patch("donna.brain.candidates.llm", llm):
+            await generate_candidates(self._ctx())
+            await generate_candidates(self._ctx(signals=("canvas_deadline_approaching",)))
+            await generate_candidates(self._ctx(last_time="2025-06-15T11:00:00"))
+
+        assert llm.ainvoke.await_count == 3
+
+    async def test_expired_entries_are_pruned_on_insert(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": []}')
+
+        with patch("donna.brain.candidates.llm", llm):
+            await generate_candidates(self._ctx())
+            (stale_key,) = candidates_mod._empty_result_cache
+            candidates_mod._empty_result_cache[stale_key] = 0.0
+            await generate_candidates(self._ctx(last_time="2025-06-15T11:00:00"))
+
+        assert stale_key not in candidates_mod._empty_result_cache
+        assert len(candidates_mod._empty_result_cache) == 1
+
+    async def test_non_empty_answer_is_not_cached(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": [{"message": "Gym at 6?"}]}')
+
+        with patch("donna.brain.candidates.llm", llm):
+            await generate_candidates(self._ctx())
+            await generate_candidates(self._ctx())
+
+        assert llm.ainvoke.await_count == 2
+
+
+class TestGate:
+
+    async def test_gate_no_skips_full_model(self, patch_candidate_gate):
+        patch_candidate_gate.ainvoke.return_value = _response("NO")
+        llm = AsyncMock()
+
+        with patch("donna.brain.candidates.llm", llm):
+            assert await generate_candidates({"user_id": "u1", "signals": []}) == []
+
+        llm.ainvoke.assert_not_called()
+
+    async def test_gate_failure_falls_through(self, patch_candidate_gate):
+        patch_candidate_gate.ainvoke.side_effect = RuntimeError("timeout")
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": [{"message": "Gym at 6?"}]}')
+
+        with patch("donna.brain.candidates.llm", llm):
+            result = await generate_candidates({"user_id": "u1", "signals": []})
+
+        assert [c["message"] for c in result] == ["Gym at 6?"]
+
+
+class TestPrompt:
+
+    async def test_prompt_is_compact_and_projected(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": []}')
+        context = {
+            "user_id": "u1",
+            "signals": [{"type": "calendar_gap_detected", "data": {}}],
+            "user": {"name": "Ana"},
+            "internal_debug": {"not": "for the model"},
+        }
+
+        with patch("donna.brain.candidates.llm", llm):
+            await generate_candidates(context)
+
+        prompt = llm.ainvoke.call_args.args[0][1].content
+        assert "\n" not in prompt
+        assert "internal_debug" not in prompt
+        assert list(json.loads(prompt)) == ["user_id", "user", "signals"]
+
+    async def test_prompt_caps_long_messages(self):
+        llm = AsyncMock()
+        llm.ainvoke.return_value = _response('{"candidates": []}')
+        context = {
+            "user_id": "u1",
+            "signals": [],
+            "recent_conversation": [{"role": "assistant", "content": "x" * 1000, "time": ""}],
+        }
+
+        with patch("donna.brain.candidates.llm", llm):
+            await generate_candidates(context)
+
+        prompt = json.loads(llm.ainvoke.call_args.args[0][1].content)
+        assert len(prompt["recent_conversation"][0]["content"]) == 400
+        assert len(context["recent_conversation"][0]["content"]) == 1000
@@ -0,0 +1,183 @@
+"""Tests for donna.brain.context — context assembly."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from donna.brain import context as context_mod
+from donna.brain.context import build_context, invalidate_context_cache
+from tests.conftest import make_chat_message, make_memory_fact, make_mood, make_task, make_user
+
+
+def _mock_recall_llm():
+    mock_resp = AsyncMock()
+    mock_resp.content = '{"queries": ["pizza"]}'
+    mock_llm = AsyncMock()
+    mock_llm.ainvoke.return_value = mock_resp
+    return mock_llm
+
+
+class TestRecallGating:
+
+    async def test_skips_recall_without_memory_facts(self, db_session, patch_async_session):
+        db_session.add(make_user(id="ctx-nofacts"))
+        await db_session.commit()
+
+        recall_llm = _mock_recall_llm()
+        with patch("donna.memory.recall.llm", recall_llm):
+            ctx = await build_context("ctx-nofacts", [])
+
+        assert ctx["recalled_memories"] == []
+        recall_llm.ainvoke.assert_not_called()
+
+    async def test_runs_recall_with_memory_facts(self, db_session, patch_async_session):
+        db_session.add_all([
+            make_user(id="ctx-facts"),
+            make_memory_fact("ctx-facts", fact="likes pizza"),
+        ])
+        await db_session.commit()
+
+        recall_llm = _mock_recall_llm()
+        with patch("donna.memory.recall.llm", recall_llm):
+            ctx = await build_context("ctx-facts", [])
+
+        recall_llm.ainvoke.assert_called_once()
+        assert [m["fact"] for m in ctx["recalled_memories"]] == ["likes pizza"]
+
+
+class TestCoalescing:
+
+    async def test_concurrent_calls_share_db_reads(self, db_session, patch_async_session):
+        db_session.add(make_user(id="ctx-burst"))
+        await db_session.commit()
+
+        loader = AsyncMock(wraps=context_mod._load_db_sections)
+        with patch("donna.brain.context._load_db_sections", loader):
+            first, second = await asyncio.gather(
+                build_context("ctx-burst", []),
+                build_context("ctx-burst", []),
+            )
+
+        loader.assert_awaited_once()
+        assert first["user"] == second["user"]
+
+    async def test_invalidate_forces_fresh_reads(self, db_session, patch_async_session):
+        db_session.add(make_user(id="ctx-inval"))
+        await db_session.commit()
+
+        loader = AsyncMock(wraps=context_mod._load_db_sections)
+        with patch("donna.brain.context._load_db_sections", loader):
+            await build_context("ctx-inval", [])
+            invalidate_context_cache("ctx-inval")
+            await build_context("ctx-inval", [])
+
+        assert loader.await_count == 2
+
+
+    async def test_locks_and_expired_entries_are_dropped(self, db_session, patch_async_session):
+        db_session.add_all([
+            make_user(id="ctx-old", phone="+6500000001"),
+            make_user(id="ctx-new", phone="+6500000002"),
+        ])
+        await db_session.commit()
+
+        await build_context("ctx-old", [])
+        stored_at, sections = context_mod._db_sections_cache["ctx-old"]
+        context_mod._db_sections_cache["ctx-old"] = (
+            stored_at - context_mod._DB_SECTIONS_TTL_SECONDS, sections,
+        )
+        await build_context("ctx-new", [])
+
+        assert list(context_mod._db_sections_cache) == ["ctx-new"]
+        assert not context_mod._db_sections_locks
+
+
+class TestConnectionBound:
+
+    async def test_concurrent_users_share_background_slots(self, db_session, patch_async_session):
+        from db import session as session_mod
+
+        users = [make_user(id=f"ctx-bound-{i}", phone=f"+650000010{i}") for i in range(4)]
+        db_session.add_all(users)
+        await db_session.commit()
+
+        open_now = peak = 0
+        factory = patch_async_session
+
+        @asynccontextmanager
+        async def counting_session():
+            nonlocal open_now, peak
+            open_now += 1
+            peak = max(peak, open_now)
+            try:
+                async with factory() as session:
+                    yield session
+            finally:
+                open_now -= 1
+
+        with patch.object(session_mod, "async_session", counting_session):
+            await asyncio.gather(*[build_context(u.id, []) for u in users])
+
+        assert 0 < peak <= session_mod.BACKGROUND_MAX_SESSIONS
+
+
+class TestConversation:
+
+    async def test_long_messages_keep_full_text(self, db_session, patch_async_session):
+        """The prompt caps message length; the context keeps full text for dedup."""
+        db_session.add_all([
+            make_user(id="ctx-long"),
+            make_chat_message("ctx-long", role="assistant", content="x" * 1000),
+        ])
+        await db_session.commit()
+
+        ctx = await build_context("ctx-long", [])
+
+        assert len(ctx["recent_conversation"][0]["content"]) == 1000
+
+
+    async def test_last_assistant_time_found_beyond_history_page(self, db_session, patch_async_session):
+        now = datetime(2025, 6, 15, 12, 0)
+        db_session.add_all([
+            make_user(id="ctx-page"),
+            make_chat_message("ctx-page", role="assistant", created_at=now - timedelta(hours=3)),
+            *[
+                make_chat_message("ctx-page", role="user", created_at=now - timedelta(minutes=60 - i))
+                for i in range(12)
+            ],
+        ])
+        await db_session.commit()
+
+        ctx = await build_context("ctx-page", [], now=now)
+
+        assert all(m["role"] == "user" for m in ctx["recent_conversation"])
+        assert ctx["minutes_since_last_message"] == 180.0
+
+
+class TestCurrentTime:
+
+    async def test_time_is_in_user_timezone(self, db_session, patch_async_session):
+        db_session.add(make_user(id="ctx-tz", timezone="Asia/Singapore"))
+        await db_session.commit()
+
+        # 20:00 UTC Sunday is 04:00 Monday in Singapore
+        ctx = await build_context("ctx-tz", [], now=datetime(2025, 6, 15, 20, 0))
+
+        assert ctx["current_time"] == "2025-06-16T04:00:00+08:00"
+        assert ctx["day_of_week"] == "Monday"
+
+    async def test_prompt_timestamps_share_the_user_timezone(self, db_session, patch_async_session):
+        db_session.add_all([
+            make_user(id="ctx-tz-all", timezone="Asia/Singapore"),
+            make_chat_message("ctx-tz-all", created_at=datetime(2025, 6, 15, 19, 30)),
+            make_task("ctx-tz-all", due_date=datetime(2025, 6, 16, 1, 0)),
+            make_mood("ctx-tz-all", created_at=datetime(2025, 6, 15, 18, 0)),
+        ])
+        await db_session.commit()
+
+        ctx = await build_context("ctx-tz-all", [], now=datetime(2025, 6, 15, 20, 0))
+
+        assert ctx["recent_conversation"][0]["time"] == "2025-06-16T03:30:00+08:00"
+        assert ctx["pending_tasks"][0]["due_date"] == "2025-06-16T09:00:00+08:00"
+        assert ctx["recent_moods"][0]["date"] == "2025-06-16T02:00:00+08:00"
@@ -1,14 +1,18 @@
 """Tests for donna.brain.rules — scoring and filtering logic."""
 
 import unittest.mock as mock
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from donna.brain.rules import (
     W_RELEVANCE,
     W_TIMING,
     W_URGENCY,
+    count_proactive_today,
+    record_proactive_sent,
     score_and_filter,
 )
+from tests.conftest import make_chat_message, make_user
 
 
 def _patch_local_hour(hour: int):
@@ -189,6 +193,25 @@ class TestDedup:
             result = score_and_filter(cands, _ctx(conversation=conversation))
         assert len(result) == 1
 
+    def test_dedup_allows_longer_message_containing_short_recent(self):
+        """A short recent message can cover at most its own share of a longer candidate."""
+        conversation = [
+            {"role": "assistant", "content": "SE assignment due", "time": ""},
+        ]
+        cands = [_candidate(msg="SE assignment due Friday, want to block tonight for it")]
+        with _patch_local_hour(14):
+            result = score_and_filter(cands, _ctx(conversation=conversation))
+        assert len(result) == 1
+
+    def test_dedup_blocks_longer_message_with_high_overlap(self):
+        conversation = [
+            {"role": "assistant", "content": "SE assignment due Friday at midnight", "time": ""},
+        ]
+        cands = [_candidate(msg="SE assignment due Friday at midnight sharp")]
+        with _patch_local_hour(14):
+            result = score_and_filter(cands, _ctx(conversation=conversation))
+        assert len(result) == 0
+
 
 class TestEmptyInput:
     def test_empty_candidates(self):
@@ -199,3 +222,37 @@ class TestEmptyInput:
         with _patch_local_hour(14):
             result = score_and_filter(cands, {"minutes_since_last_message": 60})
         assert isinstance(result, list)
+
+
+class TestProactiveCount:
+    async def _add_proactive(self, db_session, user_id):
+        msg = make_chat_message(user_id, role="assistant", content="nudge")
+        msg.is_proactive = True
+        db_session.add(msg)
+        await db_session.commit()
+
+    async def test_count_is_cached(self, db_session, patch_async_session):
+        db_session.add(make_user(id="cap-cache"))
+        await self._add_proactive(db_session, "cap-cache")
+
+        assert await count_proactive_today("cap-cache") == 1
+        # A send from elsewhere isn't seen until the TTL expires
+        await self._add_proactive(db_session, "cap-cache")
+        assert await count_proactive_today("cap-cache") == 1
+
+    async def test_record_sent_bumps_cached_count(self, db_session, patch_async_session):
+        db_session.add(make_user(id="cap-bump"))
+        await db_session.commit()
+
+        assert await count_proactive_today("cap-bump") == 0
+        record_proactive_sent("cap-bump")
+        assert await count_proactive_today("cap-bump") == 1
+
+    async def test_new_day_reads_db(self, db_session, patch_async_session):
+        db_session.add(make_user(id="cap-day"))
+        await self._add_proactive(db_session, "cap-day")
+        now = datetime.now(UTC).replace(tzinfo=None)
+
+        assert await count_proactive_today("cap-day", now=now) == 1
+        tomorrow = now.replace(hour=0, minute=0) + timedelta(days=1)
+        assert await count_proactive_today("cap-day", now=tomorrow) == 0
@@ -0,0 +1,56 @@
+"""Tests for donna.brain.sender — WhatsApp routing by service window."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from donna.brain.sender import send_proactive_message
+from tests.conftest import make_chat_message, make_user
+
+_CANDIDATE = {"message": "Your essay is due tomorrow. Start tonight?", "category": "deadline_warning"}
+
+
+def _patch_whatsapp():
+    return (
+        patch("donna.brain.sender.send_whatsapp_message", new_callable=AsyncMock),
+        patch("donna.brain.sender.send_whatsapp_template", new_callable=AsyncMock),
+    )
+
+
+class TestWindowRouting:
+
+    async def test_recent_user_message_sends_freeform(self, db_session, patch_async_session):
+        db_session.add_all([
+            make_user(id="send-open", phone="+6511111111"),
+            make_chat_message("send-open", role="user"),
+        ])
+        await db_session.commit()
+
+        freeform, template = _patch_whatsapp()
+        with freeform as send_text, template as send_template:
+            assert await send_proactive_message("send-open", dict(_CANDIDATE)) is True
+
+        send_text.assert_awaited_once_with(to="+6511111111", text=_CANDIDATE["message"])
+        send_template.assert_not_called()
+
+    async def test_stale_window_sends_template(self, db_session, patch_async_session):
+        old = datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=30)
+        db_session.add_all([
+            make_user(id="send-closed", phone="+6522222222"),
+            make_chat_message("send-closed", role="user", created_at=old),
+        ])
+        await db_session.commit()
+
+        freeform, template = _patch_whatsapp()
+        with freeform as send_text, template as send_template:
+            assert await send_proactive_message("send-closed", dict(_CANDIDATE)) is True
+
+        send_text.assert_not_called()
+        assert send_template.await_args.kwargs["template_name"] == "donna_deadline_v2"
+
+    async def test_unknown_user_is_not_sent(self, db_session, patch_async_session):
+        freeform, template = _patch_whatsapp()
+        with freeform as send_text, template as send_template:
+            assert await send_proactive_message("send-missing", dict(_CANDIDATE)) is False
+
+        send_text.assert_not_called()
+        send_template.assert_not_called()
@@ -0,0 +1,41 @@
+"""Tests for donna.memory.recall — keyword recall over memory facts."""
+
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy import select
+
+from db.models import MemoryFact
+from donna.memory.recall import recall_relevant_memories
+from tests.conftest import make_memory_fact, make_user
+
+
+def _mock_recall_llm(queries: str):
+    mock_resp = AsyncMock()
+    mock_resp.content = queries
+    mock_llm = AsyncMock()
+    mock_llm.ainvoke.return_value = mock_resp
+    return mock_llm
+
+
+class TestLastReferenced:
+
+    async def test_marks_only_recalled_facts(self, db_session, patch_async_session):
+        db_session.add_all([
+            make_user(id="recall-ref"),
+            make_memory_fact("recall-ref", fact="likes pizza", id="fact-pizza"),
+            make_memory_fact("recall-ref", fact="hates mornings", id="fact-mornings"),
+        ])
+        await db_session.commit()
+
+        with patch("donna.memory.recall.llm", _mock_recall_llm('{"queries": ["pizza"]}')):
+            recalled = await recall_relevant_memories("recall-ref", {})
+
+        assert [m["fact"] for m in recalled] == ["likes pizza"]
+
+        result = await db_session.execute(
+            select(MemoryFact.id, MemoryFact.last_referenced)
+            .execution_options(populate_existing=True)
+        )
+        referenced = {row.id: row.last_referenced for row in result.all()}
+        assert referenced["fact-pizza"] is not None
+        assert referenced["fact-mornings"] is None
@@ -1,7 +1,11 @@
 """Tests for donna.signals.dedup — signal deduplication."""
 
+from datetime import UTC, datetime, timedelta
+
 import pytest
+from sqlalchemy import select
 
+from db.models import SignalState
 from donna.signals.base import Signal, SignalType
 from donna.signals.dedup import deduplicate_signals
 from tests.conftest import make_user
@@ -121,3 +125,30 @@ async def test_empty_list(db_session, patch_async_session, user_id):
     """Empty input should return empty output."""
     result = await deduplicate_signals(user_id, [])
     assert result == []
+
+
+async def test_signal_reemitted_after_window(db_session, patch_async_session, user_id):
+    """A signal last seen longer ago than its re-emit window passes again."""
+    user = make_user(id=user_id)
+    db_session.add(user)
+    await db_session.commit()
+
+    def _sig():
+        return Signal(
+            type=SignalType.TASK_OVERDUE,
+            user_id=user_id,
+            data={"title": "SE homework"},
+            source="internal",
+        )
+
+    assert len(await deduplicate_signals(user_id, [_sig()])) == 1
+
+    # Age the state past TASK_OVERDUE's 12h window
+    state = (await db_session.execute(select(SignalState))).scalar_one()
+    state.last_seen = datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=13)
+    await db_session.commit()
+
+    assert len(await deduplicate_signals(user_id, [_sig()])) == 1
+
+    await db_session.refresh(state)
+    assert state.times_seen == 2
@@ -291,3 +291,27 @@ class TestDonnaScenarios:
 
         assert sent == 1
         mock_wa.assert_called_once()
+
+    async def test_scenario_daily_cap_skips_run(self, db_session, patch_async_session):
+        """4 proactive messages already today → no signals collected, no LLM call."""
+        user = make_user(id="s-capped")
+        sent_earlier = []
+        for _ in range(4):
+            msg = make_chat_message(user_id="s-capped", role="assistant", content="nudge")
+            msg.is_proactive = True
+            sent_earlier.append(msg)
+        db_session.add_all([user, *sent_earlier])
+        await db_session.commit()
+
+        candidate_llm = _mock_llm_response([])
+        with (
+            patch("donna.signals.collector.collect_calendar_signals", new_callable=AsyncMock) as mock_cal,
+            patch("donna.brain.candidates.llm", candidate_llm),
+            patch("donna.brain.sender.send_whatsapp_message", new_callable=AsyncMock) as mock_wa,
+        ):
+            sent = await donna_loop("s-capped")
+
+        assert sent == 0
+        mock_cal.assert_not_called()
+        candidate_llm.ainvoke.assert_not_called()
+        mock_wa.assert_not_called()
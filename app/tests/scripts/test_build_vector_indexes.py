@@ -0,0 +1,31 @@
+"""Tests for scripts/build_vector_indexes.py — index type and parameters by row count."""
+
+from db.models import MemoryFact
+from scripts.build_vector_indexes import configure_vector_index
+
+
+class TestConfigureVectorIndex:
+    def test_empty_table_uses_small_hnsw(self):
+        assert "USING hnsw" in configure_vector_index(0)
+        assert "WITH (m='16', ef_construction='64')" in configure_vector_index(0)
+
+    def test_small_tier_ends_below_100k(self):
+        assert "m='16', ef_construction='64'" in configure_vector_index(99_999)
+        assert "m='24', ef_construction='100'" in configure_vector_index(100_000)
+
+    def test_medium_tier_ends_below_1m(self):
+        assert "m='24', ef_construction='100'" in configure_vector_index(999_999)
+        assert "USING ivfflat" in configure_vector_index(1_000_000)
+
+    def test_ivfflat_lists_is_sqrt_of_rows(self):
+        assert "WITH (lists='2000')" in configure_vector_index(4_000_000)
+
+    def test_opclass_matches_halfvec_column(self):
+        assert "(embedding halfvec_cosine_ops)" in configure_vector_index(10)
+
+    def test_declared_index_matches_empty_table_tier(self):
+        """create_all() must build what the script would, or the first run rebuilds it."""
+        index = next(i for i in MemoryFact.__table__.indexes if i.name == "ix_memory_fact_embedding")
+        params = index.dialect_options["postgresql"]["with"]
+        expected = ", ".join(f"{k}='{v}'" for k, v in params.items())
+        assert f"WITH ({expected})" in configure_vector_index(0)
@@ -1,5 +1,6 @@
 import logging
 import re
+import time
 from datetime import datetime, timedelta, timezone
 
 import httpx
@@ -11,6 +12,15 @@ from db.session import async_session
 
 logger = logging.getLogger(__name__)
 
+_LINK_NEXT_RE = re.compile(r'<([^>]+)>;\s*rel="next"', re.I)
+
+# A user's Canvas PAT changes only when they paste a new one, yet every
+# proactive tick reads it twice (assignments + grades). Cache it per user,
+# including "not connected", and let the token-storing paths invalidate.
+CANVAS_TOKEN_TTL_SECONDS = 300
+
+_canvas_token_cache: dict[str, tuple[float, str | None]] = {}
+
 
 def _parse_link_next(link_header: str | None) -> str | None:
     """Extract the 'next' page URL from Canvas Link header."""
@@ -18,7 +28,7 @@ def _parse_link_next(link_header: str | None) -> str | None:
         return None
     for part in link_header.split(","):
         part = part.strip()
-        match = re.match(r'<([^>]+)>;\s*rel="next"', part, re.I)
+        match = _LINK_NEXT_RE.match(part)
         if match:
             return match.group(1)
     return None
@@ -53,15 +63,25 @@ async def _fetch_all_pages(
 
 async def _get_canvas_token(user_id: str) -> str | None:
     """Retrieve the user's Canvas PAT from the database."""
+    cached = _canvas_token_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < CANVAS_TOKEN_TTL_SECONDS:
+        return cached[1]
+
     async with async_session() as session:
         result = await session.execute(
-            select(OAuthToken).where(
+            select(OAuthToken.access_token).where(
                 OAuthToken.user_id == user_id,
                 OAuthToken.provider == "canvas",
             )
         )
         token = result.scalar_one_or_none()
-    return token.access_token if token else None
+    _canvas_token_cache[user_id] = (time.monotonic(), token)
+    return token
+
+
+def invalidate_canvas_token(user_id: str) -> None:
+    """Drop a user's cached Canvas PAT, e.g. after they store a new one."""
+    _canvas_token_cache.pop(user_id, None)
 
 
 async def get_canvas_assignments(user_id: str, entities: dict = None, **kwargs) -> list[dict]:
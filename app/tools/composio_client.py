@@ -6,6 +6,7 @@ asyncio.to_thread() to avoid blocking FastAPI's event loop.
 
 import asyncio
 import logging
+import time
 
 from composio import Composio
 
@@ -24,6 +25,13 @@ _TOOLKIT_MAP = {
     "MICROSOFTOUTLOOK": "microsoft",
 }
 
+# Connected accounts only change through the OAuth callbacks, yet every
+# proactive tick and reply looks them up several times. Cache per user and
+# let the callbacks invalidate, so a new connection shows up immediately.
+CONNECTED_INTEGRATIONS_TTL_SECONDS = 300
+
+_connected_cache: dict[str, tuple[float, list[str]]] = {}
+
 
 async def execute_tool(slug: str, user_id: str, arguments: dict) -> dict:
     """Execute a Composio tool action, returning the result dict."""
@@ -42,6 +50,10 @@ async def execute_tool(slug: str, user_id: str, arguments: dict) -> dict:
 
 async def get_connected_integrations(user_id: str) -> list[str]:
     """Return deduplicated provider names the user has active on Composio."""
+    cached = _connected_cache.get(user_id)
+    if cached and time.monotonic() - cached[0] < CONNECTED_INTEGRATIONS_TTL_SECONDS:
+        return cached[1]
+
     connections = await asyncio.to_thread(
         composio.connected_accounts.list,
         user_ids=[user_id],
@@ -52,7 +64,14 @@ async def get_connected_integrations(user_id: str) -> list[str]:
         slug = getattr(c.toolkit, "slug", None) or ""
         if slug:
             providers.add(_TOOLKIT_MAP.get(slug.upper(), slug))
-    return list(providers)
+    result = list(providers)
+    _connected_cache[user_id] = (time.monotonic(), result)
+    return result
+
+
+def invalidate_connected_integrations(user_id: str) -> None:
+    """Drop a user's cached integrations, e.g. after an OAuth callback."""
+    _connected_cache.pop(user_id, None)
 
 
 async def get_email_provider(user_id: str) -> str:
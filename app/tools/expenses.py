@@ -53,24 +53,22 @@ async def get_expense_summary(user_id: str, entities: dict = None, **kwargs) ->
     days = 7 if period == "week" else 30
     cutoff = datetime.utcnow() - timedelta(days=days)
 
+    # Aggregate per category in SQL; only one row per category comes back
+    category = func.coalesce(func.nullif(Expense.category, ""), "other")
     async with async_session() as session:
         result = await session.execute(
-            select(Expense).where(
+            select(category, func.sum(Expense.amount), func.count())
+            .where(
                 Expense.user_id == user_id,
                 Expense.created_at >= cutoff,
             )
+            .group_by(category)
         )
-        expenses = result.scalars().all()
-
-    total = sum(e.amount for e in expenses)
-    by_category: dict[str, float] = {}
-    for e in expenses:
-        cat = e.category or "other"
-        by_category[cat] = by_category.get(cat, 0) + e.amount
+        rows = result.all()
 
     return {
         "period": period,
-        "total": round(total, 2),
-        "by_category": {k: round(v, 2) for k, v in by_category.items()},
-        "transaction_count": len(expenses),
+        "total": round(sum(amount for _, amount, _ in rows), 2),
+        "by_category": {cat: round(amount, 2) for cat, amount, _ in rows},
+        "transaction_count": sum(count for _, _, count in rows),
     }
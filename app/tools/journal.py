@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from db.models import JournalEntry, MoodLog, generate_uuid
 from db.session import async_session
@@ -50,20 +50,18 @@ async def log_mood(user_id: str, entities: dict = None, **kwargs) -> dict:
         session.add(mood)
         await session.commit()
 
-        # Calculate trend
+        # Calculate trend — averaged in SQL, no rows hydrated
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
         result = await session.execute(
-            select(MoodLog)
+            select(func.avg(MoodLog.score), func.count())
             .where(MoodLog.user_id == user_id, MoodLog.created_at >= seven_days_ago)
-            .order_by(MoodLog.created_at.desc())
         )
-        recent = result.scalars().all()
-        avg = sum(m.score for m in recent) / len(recent) if recent else score
+        avg, count = result.one()
 
     return {
         "score": score,
-        "trend_7d_avg": round(avg, 1),
-        "entries_this_week": len(recent),
+        "trend_7d_avg": round(float(avg) if count else score, 1),
+        "entries_this_week": count,
     }
 
 
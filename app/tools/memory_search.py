@@ -1,9 +1,9 @@
 import logging
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 
-from db.models import MemoryFact
+from db.models import MemoryFact, MoodLog, Task
 from db.session import async_session
 
 logger = logging.getLogger(__name__)
@@ -19,7 +19,10 @@ async def search_memory(user_id: str, entities: dict = None, **kwargs) -> list[d
 
     async with async_session() as session:
         result = await session.execute(
-            select(MemoryFact)
+            select(
+                MemoryFact.id, MemoryFact.fact, MemoryFact.category,
+                MemoryFact.confidence, MemoryFact.created_at,
+            )
             .where(
                 MemoryFact.user_id == user_id,
                 MemoryFact.fact.ilike(f"%{query}%"),
@@ -27,12 +30,16 @@ async def search_memory(user_id: str, entities: dict = None, **kwargs) -> list[d
             .order_by(MemoryFact.created_at.desc())
             .limit(10)
         )
-        facts = result.scalars().all()
+        facts = result.all()
 
-        # Update last_referenced timestamp
-        for fact in facts:
-            fact.last_referenced = datetime.utcnow()
-        await session.commit()
+        # Update last_referenced timestamp in one statement
+        if facts:
+            await session.execute(
+                update(MemoryFact)
+                .where(MemoryFact.id.in_([f.id for f in facts]))
+                .values(last_referenced=datetime.now(UTC).replace(tzinfo=None))
+            )
+            await session.commit()
 
     return [
         {
@@ -52,26 +59,38 @@ async def get_user_context(user_id: str, entities: dict = None, **kwargs) -> dic
     """
     # This is largely handled by the context_loader node,
     # but this tool allows Claude to explicitly request a context refresh.
-    from tools.tasks import get_tasks
-    from tools.journal import get_mood_history
+    seven_days_ago = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=7)
 
-    tasks = await get_tasks(user_id, status="pending")
-    moods = await get_mood_history(user_id, days=7)
+    # Only counts and an average are reported, so aggregate in SQL: both come
+    # back in one round-trip as scalar subqueries, sharing one session with
+    # the facts query instead of three separate tool calls.
+    pending_count = (
+        select(func.count())
+        .select_from(Task)
+        .where(Task.user_id == user_id, Task.status == "pending")
+        .scalar_subquery()
+    )
+    mood_avg = (
+        select(func.avg(MoodLog.score))
+        .where(MoodLog.user_id == user_id, MoodLog.created_at >= seven_days_ago)
+        .scalar_subquery()
+    )
 
-    # Recent memory facts
     async with async_session() as session:
+        result = await session.execute(select(pending_count, mood_avg))
+        pending_tasks, avg = result.one()
+
+        # Recent memory facts
         result = await session.execute(
-            select(MemoryFact)
+            select(MemoryFact.fact)
             .where(MemoryFact.user_id == user_id)
             .order_by(MemoryFact.created_at.desc())
-            .limit(10)
+            .limit(5)
         )
-        recent_facts = result.scalars().all()
+        recent_topics = list(result.scalars().all())
 
     return {
-        "pending_tasks": len(tasks),
-        "recent_mood_avg": (
-            round(sum(m["score"] for m in moods) / len(moods), 1) if moods else None
-        ),
-        "recent_topics": [f.fact for f in recent_facts[:5]],
+        "pending_tasks": pending_tasks,
+        "recent_mood_avg": round(float(avg), 1) if avg is not None else None,
+        "recent_topics": recent_topics,
     }
@@ -1,9 +1,9 @@
 import logging
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from db.models import Task, generate_uuid
+from db.models import Task, generate_uuid, is_uuid
 from db.session import async_session
 
 logger = logging.getLogger(__name__)
@@ -73,17 +73,21 @@ async def complete_task(user_id: str, entities: dict = None, **kwargs) -> dict:
     task_id = kwargs.get("task_id")
     if not task_id:
         return {"error": "task_id required"}
+    # The id comes from the LLM; a made-up one must read as not found, not a DB error
+    if not is_uuid(task_id):
+        return {"error": "task not found"}
 
+    # One UPDATE ... RETURNING instead of loading the row and writing it back
     async with async_session() as session:
         result = await session.execute(
-            select(Task).where(Task.id == task_id, Task.user_id == user_id)
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id)
+            .values(status="done", completed_at=datetime.utcnow())
+            .returning(Task.title)
         )
-        task = result.scalar_one_or_none()
-        if not task:
+        title = result.scalar_one_or_none()
+        if title is None:
             return {"error": "task not found"}
-
-        task.status = "done"
-        task.completed_at = datetime.utcnow()
         await session.commit()
 
-    return {"success": True, "title": task.title}
+    return {"success": True, "title": title}
@@ -2,7 +2,7 @@ import logging
 
 from sqlalchemy import select
 
-from db.models import VoiceNote
+from db.models import VoiceNote, is_uuid
 from db.session import async_session
 
 logger = logging.getLogger(__name__)
@@ -42,6 +42,8 @@ async def search_voice_notes(user_id: str, entities: dict = None, **kwargs) -> l
 async def get_voice_note_summary(user_id: str, entities: dict = None, **kwargs) -> dict:
     """Get full transcript and summary of a specific voice note."""
     voice_note_id = kwargs.get("voice_note_id", "")
+    if not is_uuid(voice_note_id):
+        return {"error": "Voice note not found"}
 
     async with async_session() as session:
         result = await session.execute(